@@ -1,16 +1,12 @@
 from flask import Flask, jsonify, make_response, request, Response
 from flask_cors import CORS
 
-from tictactoe.controller import get_board_state, get_winner, make_move
-from tictactoe.view import View
+from tictactoe.controller import get_board_state, get_view, get_winner, make_move
 
 app = Flask(__name__)
 CORS(app)  # This will allow the React front-end to communicate with the Flask back-end
 
 
-VIEW = View()
-
-
 @app.route("/tictactoe/health", methods=["GET"])
 @app.route("/tictactoe/healthcheck", methods=["GET"])
 def health_check() -> Response:
@@ -37,7 +33,7 @@ def move() -> Response:
     try:
         return make_move(index)
     except ValueError as e:
-        return VIEW.error(str(e))
+        return get_view().error(str(e))
 
 if __name__ == '__main__':
     app.run(host="0.0.0.0", debug=True)
@@ -1,6 +1,6 @@
 import pytest
 
-from tictactoe import Board, SQUARE_OCCUPIED_ERROR_MSG
+from tictactoe import Board, GAME_OVER_ERROR_MSG, INVALID_MOVE_ERROR_MSG, SQUARE_OCCUPIED_ERROR_MSG
 from tictactoe.model import Model
 
 
@@ -8,61 +8,115 @@ from tictactoe.model import Model
 def model():
     return Model()
 
+def set_board(model, squares):
+    # Load a board given as a list of "X"/"O"/"" into the model's bitboards
+    model.boards = [
+        sum(1 << i for i, square in enumerate(squares) if square == "X"),
+        sum(1 << i for i, square in enumerate(squares) if square == "O"),
+    ]
+
 def test_init_board(model):
     # Test that the board is initialized correctly
-    assert isinstance(model.board, Board)
+    assert model.boards == [0, 0]
+    board = model.get_board_state()
+    assert isinstance(board, Board)
 
     # assert that there are 9 elts, all the empty string
-    assert len(model.board.squares) == 9
-    for square in model.board.squares:
+    assert len(board.squares) == 9
+    for square in board.squares:
         assert square == ""
 
 def test_move(model):
-    model.player = "X"
+    model.player_idx = 0
     model.move(0)
-    assert model.board.squares[0] == "X"
-    assert model.player == "O"
+    assert model.get_board_state().squares[0] == "X"
+    assert model.get_current_player() == "O"
     assert model.winner is None
     model.move(1)
-    assert model.board.squares[1] == "O"
-    assert model.player == "X"
+    assert model.get_board_state().squares[1] == "O"
+    assert model.get_current_player() == "X"
     assert model.winner is None
-    model.board.squares = ["X", "O", "X", "O", "X", "O", "", "", ""]
+    set_board(model, ["X", "O", "X", "O", "X", "O", "", "", ""])
     model.move(8)
     assert model.winner == "X"
 
 def test_set_winner(model):
-    model.board.squares = ["X", "X", "X", "", "", "", "", "", ""]
+    set_board(model, ["X", "X", "X", "", "", "", "", "", ""])
     model.set_winner()
     assert model.winner == "X"
     model = Model()
-    model.board.squares = ["O", "", "", "O", "", "", "O", "", ""]
+    set_board(model, ["O", "", "", "O", "", "", "O", "", ""])
     model.set_winner()
     assert model.winner == "O"
 
     # reset winner to None
     model.winner = None
-    model.board.squares = ["X", "O", "X", "O", "X", "O", "", "", ""]
+    set_board(model, ["X", "O", "X", "O", "X", "O", "", "", ""])
     model.set_winner()
     assert model.winner is None
 
 def test_get_current_player(model):
     assert model.get_current_player() == "X"
-    model.player = "O"
+    model.player_idx = 1
     assert model.get_current_player() == "O"
 
+def test_properties(model):
+    model.move(4)
+    assert model.current_player == "O"
+    assert model.board_state == model.get_board_state() == Board(("", "", "", "", "X", "", "", "", ""))
+
 def test_change_player(model):
     model.change_player()
-    assert model.player == "O"
+    assert model.get_current_player() == "O"
     model.change_player()
-    assert model.player == "X"
+    assert model.get_current_player() == "X"
 
 def test_get_board_state(model):
-    model.board.squares = ["X", "O", "X", "O", "X", "O", "", "", ""]
-    assert model.get_board_state() == Board(["X", "O", "X", "O", "X", "O", "", "", ""])
+    set_board(model, ["X", "O", "X", "O", "X", "O", "", "", ""])
+    assert model.get_board_state() == Board(("X", "O", "X", "O", "X", "O", "", "", ""))
 
 def test_move_occupied(model):
-    model.board.squares = ["X", "O", "X", "O", "X", "O", "", "", ""]
+    set_board(model, ["X", "O", "X", "O", "X", "O", "", "", ""])
     with pytest.raises(ValueError,
                        match=SQUARE_OCCUPIED_ERROR_MSG):
-        model.move(0)
\ No newline at end of file
+        model.move(0)
+
+def test_move_out_of_bounds(model):
+    for index in (-1, 9, 100):
+        with pytest.raises(ValueError, match=INVALID_MOVE_ERROR_MSG):
+            model.move(index)
+    assert model.boards == [0, 0]
+
+def test_move_game_over(model):
+    set_board(model, ["X", "X", "X", "O", "O", "", "", "", ""])
+    model.set_winner()
+    with pytest.raises(ValueError, match=GAME_OVER_ERROR_MSG):
+        model.move(5)
+
+def test_batch_evaluate():
+    x_row = 0b000000111
+    o_column = 0b001001001
+    assert Model.batch_evaluate([(x_row, 0b000011000), (0b000100110, o_column), (0, 0)]) == [1, -1, 0]
+    assert Model.batch_evaluate([]) == []
+
+def test_best_move(model):
+    # X to move takes the open square in its row rather than blocking O
+    set_board(model, ["X", "X", "", "O", "O", "", "", "", ""])
+    assert model.best_move() == 2
+
+    # O to move must block X's row
+    set_board(model, ["X", "X", "", "", "O", "", "", "", ""])
+    model.player_idx = 1
+    assert model.best_move() == 2
+
+def test_best_move_self_play_draws(model):
+    # Perfect play from both sides always ends in a draw
+    while model.winner is None and "" in model.get_board_state().squares:
+        model.move(model.best_move())
+    assert model.winner is None
+
+def test_best_move_game_over(model):
+    set_board(model, ["X", "X", "X", "O", "O", "", "", "", ""])
+    model.set_winner()
+    with pytest.raises(ValueError, match=GAME_OVER_ERROR_MSG):
+        model.best_move()
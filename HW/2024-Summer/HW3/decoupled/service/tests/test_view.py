@@ -52,3 +52,15 @@ def test_error(view, app_context):
         assert response.get_json() == {
             "error": error_msg
         }
+
+def test_board_state_cached(view, app_context):
+    board = Board([""] * 9)
+
+    with app.test_request_context():
+        view.board_state(board, 0)
+        board.squares[4] = "X"
+        # Same move counter: the body serialized for counter 0 is reused
+        response = view.board_state(board, 0)
+        assert response.get_json() == {"board": [""] * 9}
+        response = view.board_state(board, 1)
+        assert response.get_json() == {"board": ["", "", "", "", "X", "", "", "", ""]}
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 import logging
-from typing import List
+from typing import Tuple
 import sys
 
 from flask import current_app, has_request_context
@@ -8,11 +8,15 @@ from flask import current_app, has_request_context
 
 SQUARE_OCCUPIED_ERROR_MSG = "Square already occupied"
 INVALID_MOVE_ERROR_MSG = "Invalid move"
+GAME_OVER_ERROR_MSG = "Game is already over"
 
+# Bit i stands for square i; one mask per row, column, and diagonal
+WIN_MASKS = (0o007, 0o070, 0o700, 0o111, 0o222, 0o444, 0o421, 0o124)
 
-@dataclass
+
+@dataclass(frozen=True)
 class Board:
-    squares: List[str]
+    squares: Tuple[str, ...]
 
 
 logger = logging.getLogger(__name__)
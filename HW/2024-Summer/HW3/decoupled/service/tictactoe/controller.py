@@ -1,4 +1,5 @@
 import logging
+import os
 
 from flask import Response
 
@@ -7,14 +8,51 @@ from tictactoe.model import Model
 from tictactoe.view import View
 
 
-MODEL = Model()
-VIEW = View()
+# One Model/View per worker process, built on first use so forked workers never share state
+_MODEL: dict[int, Model] = {}
+_VIEW: dict[int, View] = {}
+
+# Board squares a move may target
+_VALID_INDICES = frozenset(range(9))
+# The inputs clients actually send ("0".."8" or 0..8), mapped straight to their square
+_INDEX_TABLE = {**{str(i): i for i in _VALID_INDICES}, **{i: i for i in _VALID_INDICES}}
 
 
 logger = logging.getLogger(__name__)
 configure_logger()
 
 
+def get_model() -> Model:
+    """
+    Returns the Model for the current worker process, creating it on first use.
+
+    Returns
+    -------
+    Model
+        The game model owned by this process.
+    """
+    pid = os.getpid()
+    model = _MODEL.get(pid)
+    if model is None:
+        model = _MODEL.setdefault(pid, Model())
+    return model
+
+def get_view() -> View:
+    """
+    Returns the View for the current worker process, creating it on first use.
+
+    Returns
+    -------
+    View
+        The view owned by this process.
+    """
+    pid = os.getpid()
+    view = _VIEW.get(pid)
+    if view is None:
+        view = _VIEW.setdefault(pid, View())
+    return view
+
+
 def get_board_state() -> Response:
     """
     Retrieves the current state of the board.
@@ -24,7 +62,8 @@ def get_board_state() -> Response:
     Response
         A Flask response object containing the board state as JSON.
     """
-    pass
+    model = get_model()
+    return get_view().board_state(model.board_state, model.move_counter)
 
 def get_winner() -> Response:
     """
@@ -35,7 +74,7 @@ def get_winner() -> Response:
     Response
         A Flask response object containing the winner as JSON.
     """
-    pass
+    return get_view().get_winner(get_model().winner)
 
 def validate_index(index: str) -> int:
     """
@@ -56,7 +95,21 @@ def validate_index(index: str) -> int:
     ValueError
         If the index is not a valid integer or is out of bounds.
     """
-    pass
+    try:
+        return _INDEX_TABLE[index]
+    except (KeyError, TypeError):
+        pass
+
+    # Uncommon shapes (whitespace, "+3", ...) go through the full parse
+    try:
+        i = int(index)
+    except (TypeError, ValueError):
+        logger.error('Invalid index %r - not an integer', index)
+        raise ValueError(INVALID_MOVE_ERROR_MSG)
+    if i not in _VALID_INDICES:
+        logger.error('Invalid index %d - out of bounds', i)
+        raise ValueError(INVALID_MOVE_ERROR_MSG)
+    return i
 
 def make_move(index: str) -> Response:
     """
@@ -73,7 +126,10 @@ def make_move(index: str) -> Response:
         A Flask response object indicating success or failure.
     """
     try:
-        pass
+        i = validate_index(index)
+        model = get_model()
+        model.move(i)
+        return get_view().board_state(model.board_state, model.move_counter)
     except ValueError as e:
-        logger.error(f"Error making move: {e}")
-        return VIEW.error(str(e), 400)
\ No newline at end of file
+        logger.error("Error making move: %s", e)
+        return get_view().error(str(e), 400)
\ No newline at end of file
@@ -1,22 +1,152 @@
+from __future__ import annotations
+
+from functools import lru_cache
 import logging
-from typing import Optional
+from typing import Dict, Iterable, List, Tuple
 
-from tictactoe import Board, SQUARE_OCCUPIED_ERROR_MSG
+from tictactoe import Board, GAME_OVER_ERROR_MSG, INVALID_MOVE_ERROR_MSG, SQUARE_OCCUPIED_ERROR_MSG, WIN_MASKS
+from tictactoe._kernels import HAS_LINE, winner_batch
 
 logger = logging.getLogger(__name__)
 
+# Player symbols, indexed by Model.player_idx
+PLAYERS = "XO"
+
+@lru_cache(maxsize=4096)
+def _winner_of(x: int, o: int) -> str | None:
+    """
+    Returns the winner of the position given by the two bitboards, memoized
+    since a game only ever reaches a few thousand distinct positions.
+
+    Parameters
+    ----------
+    x : int
+        Bitboard of the squares held by 'X'.
+    o : int
+        Bitboard of the squares held by 'O'.
+
+    Returns
+    -------
+    str | None
+        'X' or 'O' if that player has completed a line, otherwise None.
+    """
+    for mask in WIN_MASKS:
+        if x & mask == mask:
+            return "X"
+        if o & mask == mask:
+            return "O"
+    return None
+
+@lru_cache(maxsize=4096)
+def _board_of(x: int, o: int) -> Board:
+    """
+    Returns the read-only Board for the position given by the two bitboards,
+    shared by every caller asking for the same position.
+
+    Parameters
+    ----------
+    x : int
+        Bitboard of the squares held by 'X'.
+    o : int
+        Bitboard of the squares held by 'O'.
+
+    Returns
+    -------
+    Board
+        The board, with one of 'X', 'O', or '' per square.
+    """
+    return Board(tuple(
+        "X" if x >> i & 1 else "O" if o >> i & 1 else ""
+        for i in range(9)
+    ))
+
+# Transposition table for _negamax: (mover's bitboard, opponent's bitboard) -> (score, bound)
+_EXACT, _LOWER, _UPPER = 0, 1, 2
+_TRANSPOSITIONS: Dict[Tuple[int, int], Tuple[int, int]] = {}
+
+def _negamax(own: int, other: int, alpha: int, beta: int) -> int:
+    """
+    Scores a position for the player about to move, using alpha-beta pruning
+    and a transposition table shared by every game.
+
+    Wins score higher the sooner they happen, and losses score higher the
+    later they happen.
+
+    Parameters
+    ----------
+    own : int
+        Bitboard of the player to move.
+    other : int
+        Bitboard of the opponent.
+    alpha : int
+        The lowest score the player to move is already assured of.
+    beta : int
+        The highest score the opponent will allow.
+
+    Returns
+    -------
+    int
+        Positive if the player to move can force a win, 0 for a draw, negative for a loss.
+    """
+    empty = ~(own | other) & 0o777
+    if HAS_LINE[other]:
+        return -(bin(empty).count("1") + 1)
+    if not empty:
+        return 0
+
+    key = (own, other)
+    entry = _TRANSPOSITIONS.get(key)
+    if entry is not None:
+        score, bound = entry
+        if bound == _EXACT:
+            return score
+        if bound == _LOWER:
+            alpha = max(alpha, score)
+        else:
+            beta = min(beta, score)
+        if alpha >= beta:
+            return score
+
+    original_alpha = alpha
+    best = -10
+    moves = empty
+    while moves:
+        square = moves & -moves  # lowest empty square
+        moves ^= square
+        score = -_negamax(other, own | square, -beta, -alpha)
+        if score > best:
+            best = score
+            if best > alpha:
+                alpha = best
+                if alpha >= beta:
+                    break
+
+    if best <= original_alpha:
+        _TRANSPOSITIONS[key] = (best, _UPPER)
+    elif best >= beta:
+        _TRANSPOSITIONS[key] = (best, _LOWER)
+    else:
+        _TRANSPOSITIONS[key] = (best, _EXACT)
+    return best
+
 class Model:
     """
     A class to represent the model for the Tic Tac Toe game.
 
     Attributes
     ----------
-    board : Board
-        The current state of the Tic Tac Toe board.
-    player : str
-        The current player ('X' or 'O').
-    winner : Optional[str]
+    boards : list[int]
+        One bitboard per player, indexed like PLAYERS (bit i is square i).
+    player_idx : int
+        The current player, as an index into PLAYERS (0 for 'X', 1 for 'O').
+    winner : str | None
         The winner of the game (if any).
+    move_counter : int
+        The number of moves made so far; changes whenever the board does.
+    current_player : str
+        Read-only; the current player ('X' or 'O').
+    board_state : Board
+        Read-only; a snapshot of the current board state.
 
     Methods
     -------
@@ -29,21 +159,46 @@ class Model:
     set_winner() -> None:
         Checks for a winner and sets the winner attribute if there is one.
 
-    get_winner() -> Optional[str]:
+    get_winner() -> str | None:
         Returns the winner of the game (if any).
 
-    get_board_state() -> list[str]:
-        Returns a copy of the current board state.
+    get_board_state() -> Board:
+        Returns a read-only snapshot of the current board state.
 
     move(index: int) -> None:
         Makes a move at the specified index, changes the player, and checks for a winner.
+
+    best_move() -> int:
+        Returns the index of the best move for the current player.
+
+    batch_evaluate(states: Iterable[Tuple[int, int]]) -> List[int]:
+        Scores many positions at once: 1 if 'X' has won, -1 if 'O' has, 0 otherwise.
     """
 
+    __slots__ = ("boards", "player_idx", "winner", "move_counter")
+
     def __init__(self):
         """
         Initializes the Model with an empty board and sets the starting player to 'X'.
         """
-        pass
+        self.boards = [0, 0]
+        self.player_idx = 0
+        self.winner: str | None = None
+        self.move_counter = 0
+
+    @property
+    def current_player(self) -> str:
+        """
+        The current player ('X' or 'O').
+        """
+        return PLAYERS[self.player_idx]
+
+    @property
+    def board_state(self) -> Board:
+        """
+        A read-only snapshot of the current board state, built once per position.
+        """
+        return _board_of(*self.boards)
 
     def get_current_player(self) -> str:
         """
@@ -54,41 +209,44 @@ class Model:
         str
             The current player ('X' or 'O').
         """
-        pass
+        return PLAYERS[self.player_idx]
 
     def change_player(self) -> None:
         """
         Switches the current player from 'X' to 'O' or from 'O' to 'X'.
         """
-        pass
+        self.player_idx ^= 1
 
     def set_winner(self) -> None:
         """
         Checks for a winner and sets the winner attribute if there is one.
         """
-        pass
+        winner = _winner_of(*self.boards)
+        if winner is not None:
+            self.winner = winner
 
-    def get_winner(self) -> Optional[str]:
+    def get_winner(self) -> str | None:
         """
         Returns the winner of the game (if any).
 
         Returns
         -------
-        Optional[str]
+        str | None
             The winner of the game, or None if there is no winner yet.
         """
-        pass
+        return self.winner
 
-    def get_board_state(self) -> list[str]:
+    def get_board_state(self) -> Board:
         """
-        Returns a copy of the current board state.
+        Returns a read-only snapshot of the current board state. The snapshot
+        is only built once per position, so repeated reads between moves are free.
 
         Returns
         -------
-        list[str]
-            A copy of the current board state.
+        Board
+            A snapshot of the current board state.
         """
-        pass
+        return _board_of(*self.boards)
 
     def move(self, index: int) -> None:
         """
@@ -102,10 +260,75 @@ class Model:
         Raises
         ------
         ValueError
-            If the specified index is already occupied.
+            If the index is not between 0 and 8, the game is already over,
+            or the specified index is already occupied.
         """
-        if True:
-            pass
-        else:
-            logger.error(f'Move failed at index {index} - square already occupied')
+        if not 0 <= index <= 8:
+            logger.error('Move failed at index %s - out of bounds', index)
+            raise ValueError(INVALID_MOVE_ERROR_MSG)
+        if self.winner is not None:
+            logger.error('Move failed at index %s - game is already over', index)
+            raise ValueError(GAME_OVER_ERROR_MSG)
+
+        boards = self.boards
+        if (boards[0] | boards[1]) >> index & 1:
+            logger.error('Move failed at index %s - square already occupied', index)
             raise ValueError(SQUARE_OCCUPIED_ERROR_MSG)
+
+        player_idx = self.player_idx
+        boards[player_idx] |= 1 << index
+        self.move_counter += 1
+        winner = _winner_of(boards[0], boards[1])
+        if winner is not None:
+            self.winner = winner
+        self.player_idx = player_idx ^ 1
+
+    def best_move(self) -> int:
+        """
+        Returns the index of the best move for the current player, found by
+        searching the rest of the game tree.
+
+        Returns
+        -------
+        int
+            The index of the square to play.
+
+        Raises
+        ------
+        ValueError
+            If the game already has a winner or the board is full.
+        """
+        own = self.boards[self.player_idx]
+        other = self.boards[self.player_idx ^ 1]
+        empty = ~(own | other) & 0o777
+        if self.winner is not None or not empty:
+            logger.error('No move available - game is already over')
+            raise ValueError(GAME_OVER_ERROR_MSG)
+
+        best_index, best_score = -1, -10
+        for index in range(9):
+            square = 1 << index
+            if empty & square:
+                score = -_negamax(other, own | square, -10, 10)
+                if score > best_score:
+                    best_index, best_score = index, score
+        return best_index
+
+    @classmethod
+    def batch_evaluate(cls, states: Iterable[Tuple[int, int]]) -> List[int]:
+        """
+        Scores many positions at once, for callers such as game-tree searches or
+        replays that evaluate far more positions than a single game reaches.
+
+        Parameters
+        ----------
+        states : Iterable[Tuple[int, int]]
+            The positions to score, each as an ('X' bitboard, 'O' bitboard) pair.
+
+        Returns
+        -------
+        List[int]
+            One score per position: 1 if 'X' has won, -1 if 'O' has, 0 otherwise.
+        """
+        states = list(states)
+        return winner_batch([x for x, _ in states], [o for _, o in states])
@@ -1,41 +1,71 @@
 import logging
+from typing import Optional
+
+from flask import Response
+import orjson
 
-from flask import jsonify, make_response, Response
 from tictactoe import Board
 
 logger = logging.getLogger(__name__)
 
+JSON_MIMETYPE = "application/json"
+# Body of every winner response sent before the game is decided
+NO_WINNER_BODY = orjson.dumps({"winner": None})
+
 class View:
     """
     A class to represent the view for the Tic Tac Toe game.
 
+    Attributes
+    ----------
+    _board_cache : Optional[tuple[int, bytes]]
+        The last serialized board body and the move counter it was serialized at.
+
     Methods
     -------
-    board_state(board: Board) -> Response:
+    board_state(board: Board, move_counter: Optional[int] = None) -> Response:
         Returns the current state of the board as a JSON response.
 
     get_winner(winner: str = None) -> Response:
         Returns the winner of the game as a JSON response.
 
-    error(error: str) -> Response:
+    error(error: str, status_code: int = 400) -> Response:
         Returns an error message as a JSON response.
     """
 
-    def board_state(self, board: Board) -> Response:
+    def __init__(self):
+        """
+        Initializes the View with an empty board cache.
+        """
+        self._board_cache: Optional[tuple[int, bytes]] = None
+
+    def board_state(self, board: Board, move_counter: Optional[int] = None) -> Response:
         """
         Returns the current state of the board as a JSON response.
 
+        When a move counter is given, the serialized body is reused until the
+        counter changes, so polling between moves skips re-serialization.
+
         Parameters
         ----------
         board : Board
             The current state of the Tic Tac Toe board.
+        move_counter : int, optional
+            The model's move counter for this board state (default is None, which disables caching).
 
         Returns
         -------
         Response
             A Flask response object containing the board state.
         """
-        pass
+        cached = self._board_cache
+        if move_counter is not None and cached is not None and cached[0] == move_counter:
+            body = cached[1]
+        else:
+            body = orjson.dumps({"board": board.squares})
+            if move_counter is not None:
+                self._board_cache = (move_counter, body)
+        return Response(body, status=200, mimetype=JSON_MIMETYPE)
 
     def get_winner(self, winner: str = None) -> Response:
         """
@@ -51,9 +81,10 @@ class View:
         Response
             A Flask response object containing the winner.
         """
-        pass
+        body = NO_WINNER_BODY if winner is None else orjson.dumps({"winner": winner})
+        return Response(body, status=200, mimetype=JSON_MIMETYPE)
 
-    def error(self, error: str) -> Response:
+    def error(self, error: str, status_code: int = 400) -> Response:
         """
         Returns an error message as a JSON response.
 
@@ -61,10 +92,12 @@ class View:
         ----------
         error : str
             The error message to return.
+        status_code : int, optional
+            The HTTP status code of the response (default is 400).
 
         Returns
         -------
         Response
             A Flask response object containing the error message.
         """
-        pass
+        return Response(orjson.dumps({"error": error}), status=status_code, mimetype=JSON_MIMETYPE)
@@ -7,7 +7,7 @@ from config import ProductionConfig
 from meal_max.db import db
 from meal_max.models.battle_model import BattleModel
 from meal_max.models.kitchen_model import Meals
-from meal_max.models.mongo_session_model import login_user, logout_user
+from meal_max.models.mongo_session_model import create_session_indexes, login_user, logout_user
 from meal_max.models.user_model import Users
 
 # Load environment variables from .env file
@@ -20,6 +20,8 @@ def create_app(config_class=ProductionConfig):
     db.init_app(app)  # Initialize db with app
     with app.app_context():
         db.create_all()  # Recreate all tables
+    if not app.testing:
+        create_session_indexes()  # Tests mock out MongoDB, so there is no server to index
 
     battle_model = BattleModel()
 
@@ -275,12 +277,12 @@ def create_app(config_class=ProductionConfig):
             JSON response indicating success of the operation or error message.
         """
         try:
-            app.logger.info(f"Deleting meal by ID: {meal_id}")
+            app.logger.info("Deleting meal by ID: %s", meal_id)
 
             Meals.delete_meal(meal_id)
             return make_response(jsonify({'status': 'meal deleted'}), 200)
         except Exception as e:
-            app.logger.error(f"Error deleting meal: {e}")
+            app.logger.error("Error deleting meal: %s", e)
             return make_response(jsonify({'error': str(e)}), 500)
 
 
@@ -296,12 +298,12 @@ def create_app(config_class=ProductionConfig):
             JSON response with the meal details or error message.
         """
         try:
-            app.logger.info(f"Retrieving meal by ID: {meal_id}")
+            app.logger.info("Retrieving meal by ID: %s", meal_id)
 
             meal = Meals.get_meal_by_id(meal_id)
             return make_response(jsonify({'status': 'success', 'meal': meal}), 200)
         except Exception as e:
-            app.logger.error(f"Error retrieving meal by ID: {e}")
+            app.logger.error("Error retrieving meal by ID: %s", e)
             return make_response(jsonify({'error': str(e)}), 500)
 
 
@@ -317,7 +319,7 @@ def create_app(config_class=ProductionConfig):
             JSON response with the meal details or error message.
         """
         try:
-            app.logger.info(f"Retrieving meal by name: {meal_name}")
+            app.logger.info("Retrieving meal by name: %s", meal_name)
 
             if not meal_name:
                 return make_response(jsonify({'error': 'Meal name is required'}), 400)
@@ -325,7 +327,7 @@ def create_app(config_class=ProductionConfig):
             meal = Meals.get_meal_by_name(meal_name)
             return make_response(jsonify({'status': 'success', 'meal': meal}), 200)
         except Exception as e:
-            app.logger.error(f"Error retrieving meal by name: {e}")
+            app.logger.error("Error retrieving meal by name: %s", e)
             return make_response(jsonify({'error': str(e)}), 500)
 
 
@@ -380,7 +382,7 @@ def create_app(config_class=ProductionConfig):
 
             return make_response(jsonify({'status': 'battle complete', 'winner': winner}), 200)
         except Exception as e:
-            app.logger.error(f"Battle error: {e}")
+            app.logger.error("Battle error: %s", e)
             return make_response(jsonify({'error': str(e)}), 500)
 
     @app.route('/api/clear-combatants', methods=['POST'])
@@ -483,7 +485,7 @@ def create_app(config_class=ProductionConfig):
 
             return make_response(jsonify({'status': 'success', 'leaderboard': leaderboard_data}), 200)
         except Exception as e:
-            app.logger.error(f"Error generating leaderboard: {e}")
+            app.logger.error("Error generating leaderboard: %s", e)
             return make_response(jsonify({'error': str(e)}), 500)
 
     return app
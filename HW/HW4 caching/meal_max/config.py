@@ -7,6 +7,12 @@ class ProductionConfig():
                                            # But we are doing unnecessarily complicated Redis
                                            # write-throughs
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', "DATABASE_URL=sqlite:////app/db/app.db")  # Production database URI from environment
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": 10,          # Connections kept open and reused across requests
+        "max_overflow": 20,       # Extra connections allowed under burst load
+        "pool_timeout": 30,       # Seconds to wait for a free connection
+        "pool_pre_ping": True,    # Replace connections that went stale while idle in the pool
+    }
 
 class TestConfig():
     """Testing configuration."""
@@ -1,8 +1,14 @@
-from dataclasses import asdict, dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+import json
 import logging
-from typing import Any, List
+import os
+import threading
+import time
+from typing import Any, List, Optional
 
-from sqlalchemy import event
+from sqlalchemy import event, func, select, update
+from redis.exceptions import WatchError
 from sqlalchemy.exc import IntegrityError
 
 from meal_max.clients.redis_client import redis_client
@@ -14,9 +20,132 @@ logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
+# Allowed values, checked on every write and leaderboard request
+_VALID_DIFFICULTY = frozenset({'LOW', 'MED', 'HIGH'})
+_VALID_SORT = frozenset({'wins', 'win_pct'})
+_VALID_RESULT = frozenset({'win', 'loss'})
+
+# How long (in seconds) a computed leaderboard stays in the cache
+LEADERBOARD_CACHE_TTL = int(os.environ.get('LEADERBOARD_CACHE_TTL', 60))
+# One cached leaderboard per sort order; any change to a meal invalidates all of them
+LEADERBOARD_CACHE_KEYS = ("leaderboard:wins", "leaderboard:win_pct")
+# Bumped with every leaderboard invalidation, so a reader whose query raced a write can
+# tell and skip caching the leaderboard it computed before that write
+LEADERBOARD_VERSION_KEY = "leaderboard:version"
+
+# In-process LRU in front of Redis for get_meal_by_id. Entries expire after a few seconds so
+# changes made through other workers are picked up quickly; local writes invalidate immediately.
+MEAL_LOCAL_CACHE_SIZE = int(os.environ.get('MEAL_LOCAL_CACHE_SIZE', 2048))
+MEAL_LOCAL_CACHE_TTL = float(os.environ.get('MEAL_LOCAL_CACHE_TTL', 5))
+_local_meal_cache: "OrderedDict[int, tuple[float, dict[str, Any]]]" = OrderedDict()
+_local_meal_cache_lock = threading.Lock()
+
+# Every reader and writer of the per-meal cache builds its key from this prefix
+MEAL_KEY_PREFIX = "meal:"
+_MEAL_KEY = (MEAL_KEY_PREFIX + "{}").format
+_MEAL_NAME_KEY = "meal_name:{}".format
+
+
+def _get_local_meal(meal_id: int) -> Optional[dict[str, Any]]:
+    """
+    Look up a meal in the in-process cache.
+
+    Args:
+        meal_id (int): The ID of the meal.
+
+    Returns:
+        dict: A copy of the cached meal data, or None if it is missing or expired.
+    """
+    with _local_meal_cache_lock:
+        entry = _local_meal_cache.get(meal_id)
+        if entry is None:
+            return None
+        expires_at, meal_data = entry
+        if expires_at < time.monotonic():
+            del _local_meal_cache[meal_id]
+            return None
+        _local_meal_cache.move_to_end(meal_id)
+        return dict(meal_data)
+
+def _put_local_meal(meal_id: int, meal_data: dict[str, Any]) -> None:
+    """
+    Store a meal in the in-process cache, evicting the least recently used entry if full.
+
+    Args:
+        meal_id (int): The ID of the meal.
+        meal_data (dict): The meal data to cache.
+    """
+    with _local_meal_cache_lock:
+        _local_meal_cache[meal_id] = (time.monotonic() + MEAL_LOCAL_CACHE_TTL, dict(meal_data))
+        _local_meal_cache.move_to_end(meal_id)
+        if len(_local_meal_cache) > MEAL_LOCAL_CACHE_SIZE:
+            _local_meal_cache.popitem(last=False)
+
+def _invalidate_local_meal_cache(meal_id: Optional[int] = None) -> None:
+    """
+    Drop one meal, or every meal, from the in-process cache.
+
+    Args:
+        meal_id (int, optional): The ID of the meal to drop. Drops everything if omitted.
+    """
+    with _local_meal_cache_lock:
+        if meal_id is None:
+            _local_meal_cache.clear()
+        else:
+            _local_meal_cache.pop(meal_id, None)
+
+def _invalidate_cached_meal(meal_id: int) -> None:
+    """
+    Drop a meal's cached copies, and the leaderboards it appears in, after a bulk UPDATE.
+
+    Bulk UPDATEs skip the after_update listener, so they must invalidate the caches themselves.
+    The next read repopulates them from the database.
+
+    Args:
+        meal_id (int): The ID of the meal that changed.
+    """
+    _invalidate_local_meal_cache(meal_id)
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.delete(_MEAL_KEY(meal_id), *LEADERBOARD_CACHE_KEYS)
+    pipe.incr(LEADERBOARD_VERSION_KEY)
+    pipe.execute()
+
+def _cache_leaderboard(cache_key: str, leaderboard: List[dict[str, Any]], version: Optional[bytes]) -> None:
+    """
+    Cache a computed leaderboard, unless the leaderboards were invalidated since it was queried.
+
+    WATCH on the version key makes the check and the SET atomic: if a write bumps the
+    version after the query started, the stale leaderboard is dropped instead of being
+    served for the whole TTL.
+
+    Args:
+        cache_key (str): The leaderboard's cache key.
+        leaderboard (List[dict]): The leaderboard to cache.
+        version (bytes): The leaderboard version read before the query, or None if unset.
+    """
+    pipe = redis_client.pipeline()
+    try:
+        pipe.watch(LEADERBOARD_VERSION_KEY)
+        if pipe.get(LEADERBOARD_VERSION_KEY) != version:
+            logger.info("Leaderboard changed while it was being computed; not caching it")
+            return
+        pipe.multi()
+        pipe.set(cache_key, json.dumps(leaderboard), ex=LEADERBOARD_CACHE_TTL)
+        pipe.execute()
+    except WatchError:
+        logger.info("Leaderboard changed while it was being cached; not caching it")
+    finally:
+        pipe.reset()
+
+
 @dataclass
 class Meals(db.Model):
     __tablename__ = 'meals'
+    __table_args__ = (
+        # Backs get_leaderboard: equality on deleted, then rows already in wins order,
+        # with battles available from the index for the battles > 0 filter
+        db.Index('ix_meals_leaderboard', 'deleted', 'wins', 'battles'),
+    )
 
     id: int = db.Column(db.Integer, primary_key=True)
     meal: str = db.Column(db.String(80), unique=True, nullable=False)
@@ -27,10 +156,13 @@ class Meals(db.Model):
     wins: int = db.Column(db.Integer, default=0)
     deleted: bool = db.Column(db.Boolean, default=False)
 
+    # Attributes update_meal may change; the name is fixed once a meal is created
+    _UPDATABLE = frozenset({'cuisine', 'price', 'difficulty', 'battles', 'wins', 'deleted'})
+
     def __post_init__(self):
         if self.price < 0:
             raise ValueError("Price must be a positive value.")
-        if self.difficulty not in ['LOW', 'MED', 'HIGH']:
+        if self.difficulty not in _VALID_DIFFICULTY:
             raise ValueError("Difficulty must be 'LOW', 'MED', or 'HIGH'.")
 
     @classmethod
@@ -53,7 +185,7 @@ class Meals(db.Model):
         # Validate price and difficulty
         if price <= 0:
             raise ValueError(f"Invalid price: {price}. Price must be a positive number.")
-        if difficulty not in ['LOW', 'MED', 'HIGH']:
+        if difficulty not in _VALID_DIFFICULTY:
             raise ValueError(f"Invalid difficulty level: {difficulty}. Must be 'LOW', 'MED', or 'HIGH'.")
 
         # Create and commit the new meal
@@ -71,6 +203,15 @@ class Meals(db.Model):
                 logger.error("Database error: %s", str(e))
                 raise
 
+        # Warm the name and meal caches so the first read is a hit, and drop the stale
+        # leaderboards, all in one round trip
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.set(_MEAL_NAME_KEY(meal), str(new_meal.id))
+        pipe.set(_MEAL_KEY(new_meal.id), _encode_meal(_meal_to_dict(new_meal)))
+        pipe.delete(*LEADERBOARD_CACHE_KEYS)
+        pipe.incr(LEADERBOARD_VERSION_KEY)
+        pipe.execute()
+
     @classmethod
     def delete_meal(cls, meal_id: int) -> None:
         """
@@ -82,16 +223,19 @@ class Meals(db.Model):
         Raises:
             ValueError: If the meal with the given ID does not exist or is already deleted.
         """
-        meal = cls.query.filter_by(id=meal_id).first()
-        if not meal:
-            logger.info("Meal %s not found", meal_id)
-            raise ValueError(f"Meal {meal_id} not found")
-        if meal.deleted:
+        update_result = db.session.execute(
+            update(cls).where(cls.id == meal_id, cls.deleted.is_(False)).values(deleted=True)
+        )
+        if update_result.rowcount == 0:
+            db.session.rollback()
+            if cls._is_deleted(meal_id) is None:
+                logger.info("Meal %s not found", meal_id)
+                raise ValueError(f"Meal {meal_id} not found")
             logger.info("Meal with ID %s has already been deleted", meal_id)
             raise ValueError(f"Meal with ID {meal_id} has been deleted")
 
-        meal.deleted = True
         db.session.commit()
+        _invalidate_cached_meal(meal_id)
         logger.info("Meal with ID %s marked as deleted.", meal_id)
 
     @classmethod
@@ -109,11 +253,26 @@ class Meals(db.Model):
         Raises:
             ValueError: If an invalid sort_by parameter is provided.
         """
-        if sort_by not in ["wins", "win_pct"]:
+        if sort_by not in _VALID_SORT:
             logger.error("Invalid sort_by parameter: %s", sort_by)
             raise ValueError(f"Invalid sort_by parameter: {sort_by}")
 
-        query = cls.query.filter_by(deleted=False).filter(cls.battles > 0)
+        cache_key = f"leaderboard:{sort_by}"
+        cached_leaderboard = redis_client.get(cache_key)
+        if cached_leaderboard:
+            logger.info("Leaderboard retrieved from cache")
+            return json.loads(cached_leaderboard)
+
+        # Read the version before querying, so a write that lands during the query is noticed
+        version = redis_client.get(LEADERBOARD_VERSION_KEY)
+
+        # Select just the leaderboard columns as plain rows rather than loading Meals instances;
+        # battles > 0 in the WHERE clause keeps the win percentage division safe
+        win_pct = func.round(cls.wins * 100.0 / cls.battles, 1).label('win_pct')
+        query = (
+            select(cls.id, cls.meal, cls.cuisine, cls.price, cls.difficulty, cls.battles, cls.wins, win_pct)
+            .where(cls.deleted.is_(False), cls.battles > 0)
+        )
         if sort_by == "win_pct":
             query = query.order_by((cls.wins * 1.0 / cls.battles).desc())
         elif sort_by == "wins":
@@ -121,17 +280,18 @@ class Meals(db.Model):
 
         leaderboard = [
             {
-                'id': meal.id,
-                'meal': meal.meal,
-                'cuisine': meal.cuisine,
-                'price': meal.price,
-                'difficulty': meal.difficulty,
-                'battles': meal.battles,
-                'wins': meal.wins,
-                'win_pct': round((meal.wins / meal.battles) * 100, 1) if meal.battles > 0 else 0
+                'id': row.id,
+                'meal': row.meal,
+                'cuisine': row.cuisine,
+                'price': row.price,
+                'difficulty': row.difficulty,
+                'battles': row.battles,
+                'wins': row.wins,
+                'win_pct': row.win_pct
             }
-            for meal in query.all()
+            for row in db.session.execute(query)
         ]
+        _cache_leaderboard(cache_key, leaderboard, version)
         logger.info("Leaderboard retrieved successfully")
         return leaderboard
 
@@ -151,28 +311,99 @@ class Meals(db.Model):
             ValueError: If the meal does not exist or is deleted.
         """
         logger.info("Retrieving meal by ID: %s", meal_id)
-        cache_key = f"meal_{meal_id}"
-        cached_meal = redis_client.hgetall(cache_key)
+        meal_data = _get_local_meal(meal_id)
+        if meal_data is not None:
+            logger.info("Meal retrieved from local cache: %s", meal_id)
+            return meal_data
+
+        cache_key = _MEAL_KEY(meal_id)
+        cached_meal = redis_client.get(cache_key)
         if cached_meal:
             logger.info("Meal retrieved from cache: %s", meal_id)
-            meal_data = {k.decode(): v.decode() for k, v in cached_meal.items()}
-            meal_data["price"] = float(meal_data["price"])
-            # meal_data['deleted'] is a string. We need to convert it to a bool
-            meal_data['deleted'] = meal_data.get('deleted', 'false').lower() == 'true'
-            if meal_data['deleted']:
-                logger.info("Meal with %s %s not found", "name" if meal_name else "ID", meal_name or meal_id)
-                raise ValueError(f"Meal {meal_name or meal_id} not found")
+            meal_data = cls._decode_cached_meal(cached_meal, meal_id, meal_name)
+            _put_local_meal(meal_id, meal_data)
             return meal_data
-        meal = cls.query.filter_by(id=meal_id).first()
+        meal = db.session.get(cls, meal_id)
         if not meal or meal.deleted:
             logger.info("Meal with %s %s not found", "name" if meal_name else "ID", meal_name or meal_id)
             raise ValueError(f"Meal {meal_name or meal_id} not found")
         # Convert the meal object to a dictionary and cache it
         logger.info("Meal retrieved from database and cached: %s", meal_id)
-        meal_dict = asdict(meal)
-        redis_client.hset(cache_key, mapping={k: str(v) for k, v in meal_dict.items()})
+        meal_dict = _meal_to_dict(meal)
+        redis_client.set(cache_key, _encode_meal(meal_dict))
+        _put_local_meal(meal_id, meal_dict)
         return meal_dict
 
+    @classmethod
+    def get_meals_by_ids(cls, meal_ids: List[int]) -> List[dict[str, Any]]:
+        """
+        Retrieve several meals by ID, in one Redis round trip and at most one database query.
+
+        Meals that do not exist or are deleted are left out rather than raising, so a
+        caller restoring saved state can carry on with whatever is still available.
+
+        Args:
+            meal_ids (List[int]): The IDs of the meals.
+
+        Returns:
+            List[dict]: The data of each available meal, in the order of `meal_ids`.
+        """
+        logger.info("Retrieving meals by ID: %s", meal_ids)
+        meals: dict[int, dict[str, Any]] = {}
+        missing = []
+        for meal_id in meal_ids:
+            meal_data = _get_local_meal(meal_id)
+            if meal_data is None:
+                missing.append(meal_id)
+            else:
+                meals[meal_id] = meal_data
+
+        if missing:
+            uncached = []
+            for meal_id, cached_meal in zip(missing, redis_client.mget([_MEAL_KEY(meal_id) for meal_id in missing])):
+                if cached_meal is None:
+                    uncached.append(meal_id)
+                    continue
+                meal_data = json.loads(cached_meal)
+                if not meal_data['deleted']:
+                    _put_local_meal(meal_id, meal_data)
+                    meals[meal_id] = meal_data
+
+            if uncached:
+                logger.info("Meals retrieved from database and cached: %s", uncached)
+                pipe = redis_client.pipeline(transaction=False)
+                for meal in cls.query.filter(cls.id.in_(uncached), cls.deleted.is_(False)):
+                    meal_dict = _meal_to_dict(meal)
+                    pipe.set(_MEAL_KEY(meal.id), _encode_meal(meal_dict))
+                    _put_local_meal(meal.id, meal_dict)
+                    meals[meal.id] = meal_dict
+                pipe.execute()
+
+        return [meals[meal_id] for meal_id in meal_ids if meal_id in meals]
+
+    @staticmethod
+    def _decode_cached_meal(cached_meal: bytes, meal_id: int, meal_name: str = None) -> dict[str, Any]:
+        """
+        Convert a meal read from Redis back into meal data.
+
+        Args:
+            cached_meal (bytes): The meal's cached JSON document.
+            meal_id (int): The ID of the meal.
+            meal_name (str, optional): The name of the meal, if available.
+
+        Returns:
+            dict: The meal data as a dictionary.
+
+        Raises:
+            ValueError: If the cached meal is marked as deleted.
+        """
+        # JSON keeps the field types, so nothing needs converting back
+        meal_data = json.loads(cached_meal)
+        if meal_data['deleted']:
+            logger.info("Meal with %s %s not found", "name" if meal_name else "ID", meal_name or meal_id)
+            raise ValueError(f"Meal {meal_name or meal_id} not found")
+        return meal_data
+
     @classmethod
     def get_meal_by_name(cls, meal_name: str) -> dict[str, Any]:
         """
@@ -188,26 +419,30 @@ class Meals(db.Model):
             ValueError: If the meal does not exist or is deleted.
         """
         logger.info("Retrieving meal by name: %s", meal_name)
-        cache_key = f"meal_name:{meal_name}"
+        cache_key = _MEAL_NAME_KEY(meal_name)
 
-        # Check if name-to-ID association is cached
-        meal_id = redis_client.get(cache_key)
-        if meal_id:
-            logger.info("Meal ID %s retrieved from cache for name: %s", meal_id.decode(), meal_name)
-            # Use get_meal_by_id to retrieve the full meal data from ID
-            return cls.get_meal_by_id(int(meal_id.decode()), meal_name)
+        # Resolve the name to an ID, then fetch the meal by ID, which is usually served from
+        # the in-process cache; both lookups name their keys, so this works on Redis Cluster too
+        cached_id = redis_client.get(cache_key)
+        if cached_id:
+            meal_id = int(cached_id)
+            logger.info("Meal ID %s retrieved from cache for name: %s", meal_id, meal_name)
+            return cls.get_meal_by_id(meal_id, meal_name)
 
-        # Fallback to database if cache miss
+        # Fallback to database if cache miss, e.g. for meals created before the cache was flushed
         meal = cls.query.filter_by(meal=meal_name).first()
         if not meal or meal.deleted:
             logger.info("Meal with name %s not found", meal_name)
             raise ValueError(f"Meal {meal_name} not found")
 
-        # Cache the name-to-ID association and retrieve the full meal data
-        # TODO: This should happen when a meal is created, not here
+        # Cache the name-to-ID association and the meal data we already hold, in one round trip
         logger.info("Caching meal ID %s for name: %s", meal.id, meal_name)
-        redis_client.set(cache_key, str(meal.id))
-        return cls.get_meal_by_id(meal.id, meal_name)
+        meal_dict = _meal_to_dict(meal)
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.set(cache_key, str(meal.id))
+        pipe.set(_MEAL_KEY(meal.id), _encode_meal(meal_dict))
+        pipe.execute()
+        return meal_dict
 
     @classmethod
     def update_meal(cls, meal_id: int, **kwargs) -> None:
@@ -221,30 +456,38 @@ class Meals(db.Model):
         Raises:
             ValueError: If any attribute is invalid or if the meal is not found.
         """
-        meal = cls.query.filter_by(id=meal_id).first()
-        if not meal or meal.deleted is True:
-            logger.info("Meal with ID %s not found", meal_id)
-            raise ValueError(f"Meal {meal_id} not found")
-
-        logger.debug("Updating meal with ID %s: %s", meal_id, kwargs)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Updating meal with ID %s: %s", meal_id, kwargs)
 
         for key, value in kwargs.items():
             if key == "meal":
                 logger.info("Cannot update meal name")
                 raise ValueError("Cannot update meal name")
-            if key == "difficulty" and value not in ['LOW', 'MED', 'HIGH']:
+            if key == "difficulty" and value not in _VALID_DIFFICULTY:
                 logger.info("Invalid difficulty level: %s", value)
                 raise ValueError(f"Invalid difficulty level: {value}. Must be 'LOW', 'MED', or 'HIGH'.")
             if key == "price" and value <= 0:
                 logger.info("Invalid price: %s", value)
                 raise ValueError(f"Invalid price: {value}. Price must be a positive number.")
-            if hasattr(meal, key):
-                setattr(meal, key, value)
-            else:
+            if key not in cls._UPDATABLE:
                 logger.info("Invalid attribute: %s", key)
                 raise ValueError(f"Invalid attribute: {key}")
 
+        # Validate everything first, then write in one UPDATE without loading the meal
+        if kwargs:
+            matched = db.session.execute(
+                update(cls).where(cls.id == meal_id, cls.deleted.is_(False)).values(**kwargs)
+            ).rowcount
+        else:
+            matched = cls._is_deleted(meal_id) is False
+        if not matched:
+            db.session.rollback()
+            logger.info("Meal with ID %s not found", meal_id)
+            raise ValueError(f"Meal {meal_id} not found")
+
         db.session.commit()
+        if kwargs:
+            _invalidate_cached_meal(meal_id)
         logger.info("Meal with ID %s updated successfully", meal_id)
 
     @classmethod
@@ -259,25 +502,63 @@ class Meals(db.Model):
         Raises:
             ValueError: If the meal is not found, deleted, or the result is invalid.
         """
-        meal = cls.query.filter_by(id=meal_id).first()
-        if not meal:
-            logger.info("Meal with ID %s not found", meal_id)
-            raise ValueError(f"Meal {meal_id} not found")
-        if meal.deleted:
+        if result not in _VALID_RESULT:
+            raise ValueError(f"Invalid result: {result}. Expected 'win' or 'loss'.")
+
+        # Increment in the database itself so concurrent battles can't overwrite each other's counts
+        update_result = db.session.execute(
+            update(cls)
+            .where(cls.id == meal_id, cls.deleted.is_(False))
+            .values(battles=cls.battles + 1, wins=cls.wins + (1 if result == 'win' else 0))
+        )
+        if update_result.rowcount == 0:
+            db.session.rollback()
+            if cls._is_deleted(meal_id) is None:
+                logger.info("Meal with ID %s not found", meal_id)
+                raise ValueError(f"Meal {meal_id} not found")
             logger.info("Meal with ID %s has been deleted", meal_id)
             raise ValueError(f"Meal {meal_id} has been deleted")
 
-        if result == 'win':
-            meal.battles += 1
-            meal.wins += 1
-        elif result == 'loss':
-            meal.battles += 1
-        else:
-            raise ValueError(f"Invalid result: {result}. Expected 'win' or 'loss'.")
-
         db.session.commit()
+        _invalidate_cached_meal(meal_id)
         logger.info("Meal stats updated for ID %s: %s", meal_id, result)
 
+    @classmethod
+    def _is_deleted(cls, meal_id: int) -> Optional[bool]:
+        """
+        Look up whether a meal is deleted, to explain why a guarded UPDATE matched no rows.
+
+        Args:
+            meal_id (int): The ID of the meal.
+
+        Returns:
+            bool: Whether the meal is deleted, or None if it does not exist.
+        """
+        return db.session.execute(select(cls.deleted).where(cls.id == meal_id)).scalar_one_or_none()
+
+# Meals' dataclass field names, looked up once instead of on every serialization
+_MEAL_FIELDS = tuple(field.name for field in fields(Meals))
+
+# Serializes a meal dict for the cache. A meal dict is flat and holds only primitives, so the
+# encoder can skip json.dumps' argument handling and its per-container cycle bookkeeping; the
+# output is byte-for-byte the same as json.dumps.
+_encode_meal = json.JSONEncoder(check_circular=False).encode
+
+def _meal_to_dict(meal: Meals) -> dict[str, Any]:
+    """
+    Convert a meal to a dictionary of its fields.
+
+    Every field is a primitive, so unlike dataclasses.asdict this skips the
+    deep copy and the per-call field introspection.
+
+    Args:
+        meal (Meals): The meal to convert.
+
+    Returns:
+        dict: The meal data as a dictionary.
+    """
+    return {name: getattr(meal, name) for name in _MEAL_FIELDS}
+
 def update_cache_for_meal(mapper, connection, target):
     """
     Update the Redis cache for a meal entry after an update or delete operation.
@@ -300,16 +581,19 @@ def update_cache_for_meal(mapper, connection, target):
         - If the meal is marked as deleted (`target.deleted` is True), the function
           removes the corresponding cache entry from Redis.
         - If the meal is not marked as deleted, the function updates the Redis cache
-          entry with the latest meal data using the `hset` command.
+          entry with the latest meal data, stored as a single JSON document.
+        - Either way, the cached leaderboards are invalidated in the same round trip.
     """
-    cache_key = f"meal:{target.id}"
+    _invalidate_local_meal_cache(target.id)
+    cache_key = _MEAL_KEY(target.id)
+    pipe = redis_client.pipeline(transaction=False)
     if target.deleted:
-        redis_client.delete(cache_key)
+        pipe.delete(cache_key)
     else:
-        redis_client.hset(
-            cache_key,
-            mapping={k.encode(): str(v).encode() for k, v in asdict(target).items()}
-        )
+        pipe.set(cache_key, _encode_meal(_meal_to_dict(target)))
+    pipe.delete(*LEADERBOARD_CACHE_KEYS)
+    pipe.incr(LEADERBOARD_VERSION_KEY)
+    pipe.execute()
 
 # Register the listener for update and delete events
 event.listen(Meals, 'after_update', update_cache_for_meal)
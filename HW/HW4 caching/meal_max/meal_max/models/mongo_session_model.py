@@ -2,6 +2,7 @@ import logging
 from typing import Any, List
 
 from meal_max.clients.mongo_client import sessions_collection
+from meal_max.models.kitchen_model import Meals
 from meal_max.utils.logger import configure_logger
 
 
@@ -9,13 +10,26 @@ logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
+def create_session_indexes() -> None:
+    """
+    Create the MongoDB index that sessions are looked up by.
+
+    Every login and logout matches on `user_id`, so without this index each one
+    scans the whole sessions collection. The index is unique, so a user can only
+    ever have one session document. Creating an index that already exists is a no-op.
+    """
+    logger.info("Ensuring index on sessions.user_id.")
+    sessions_collection.create_index("user_id", unique=True)
+
 def login_user(user_id: int, battle_model) -> None:
     """
     Load the user's combatants from MongoDB into the BattleModel's combatants list.
 
     Checks if a session document exists for the given `user_id` in MongoDB.
     If it exists, clears any current combatants in `battle_model` and loads
-    the stored combatants from MongoDB into `battle_model`.
+    the stored combatants from MongoDB into `battle_model`. The session stores
+    meal IDs, which are resolved to meal data in a single batch lookup; meals
+    deleted since the session was saved are skipped.
 
     If no session is found, it creates a new session document for the user
     with an empty combatants list in MongoDB.
@@ -26,15 +40,22 @@ def login_user(user_id: int, battle_model) -> None:
                                     will be loaded.
     """
     logger.info("Attempting to log in user with ID %d.", user_id)
-    session = sessions_collection.find_one({"user_id": user_id})
+    # Only the combatants are needed, so skip fetching and decoding the rest of the document
+    session = sessions_collection.find_one({"user_id": user_id}, {"_id": 0, "combatants": 1})
 
-    if session:
-        logger.info("Session found for user ID %d. Loading combatants into BattleModel.", user_id)
+    if session is not None:
         battle_model.clear_combatants()
-        for combatant in session.get("combatants", []):
-            logger.debug("Preparing combatant: %s", combatant)
+        meal_ids = session.get("combatants", [])
+        combatants = Meals.get_meals_by_ids(meal_ids)
+        if len(combatants) < len(meal_ids):
+            logger.warning("Skipping %d unavailable combatant(s) for user ID %d.", len(meal_ids) - len(combatants), user_id)
+        # Check the level once rather than building a debug record per combatant
+        debug = logger.isEnabledFor(logging.DEBUG)
+        for combatant in combatants:
+            if debug:
+                logger.debug("Preparing combatant: %s", combatant)
             battle_model.prep_combatant(combatant)
-        logger.info("Combatants successfully loaded for user ID %d.", user_id)
+        logger.info("Loaded %d combatant(s) for user ID %d.", len(combatants), user_id)
     else:
         logger.info("No session found for user ID %d. Creating a new session with empty combatants list.", user_id)
         sessions_collection.insert_one({"user_id": user_id, "combatants": []})
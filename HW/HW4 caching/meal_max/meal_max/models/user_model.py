@@ -1,9 +1,16 @@
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import hashlib
 import logging
 import os
+import secrets
 
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from sqlalchemy import bindparam, delete, insert, select, update
 from sqlalchemy.exc import IntegrityError
 
+from meal_max.clients.redis_client import redis_client
 from meal_max.db import db
 from meal_max.utils.logger import configure_logger
 
@@ -12,13 +19,80 @@ logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
+# How long (in seconds) a username-to-ID association stays in the cache
+USER_ID_CACHE_TTL = int(os.environ.get('USER_ID_CACHE_TTL', 60))
+
+# Argon2id hasher used for every stored password; the cost parameters can be lowered for tests
+password_hasher = PasswordHasher(
+    time_cost=int(os.environ.get('ARGON2_TIME_COST', 2)),
+    memory_cost=int(os.environ.get('ARGON2_MEMORY_COST', 65536)),  # in KiB
+    parallelism=int(os.environ.get('ARGON2_PARALLELISM', 4)),
+    hash_len=32,
+)
+
+# Bulk user creation hashes passwords concurrently. Each hash already runs `parallelism`
+# threads and holds `memory_cost` KiB, so the pool gets one worker per `parallelism` cores,
+# capped so a bulk call never holds more than BULK_HASH_WORKERS hashes' memory at once
+BULK_HASH_WORKERS = int(os.environ.get(
+    'BULK_HASH_WORKERS',
+    min(4, max(1, (os.cpu_count() or 1) // password_hasher.parallelism)),
+))
+
+@functools.lru_cache(maxsize=None)
+def _dummy_hash() -> str:
+    """
+    Returns a hash to verify against on lookups for unknown users, so they cost
+    the same as a real check. Built on the first miss rather than at import, since
+    each hash takes a full Argon2 run.
+    """
+    return password_hasher.hash(secrets.token_hex(16))
+
+
 class Users(db.Model):
     __tablename__ = 'users'
 
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     salt = db.Column(db.String(32), nullable=False)  # 16-byte salt in hex
-    password = db.Column(db.String(64), nullable=False)  # SHA-256 hash in hex
+    password = db.Column(db.String(128), nullable=False)  # Argon2id hash (legacy rows: SHA-256 hash in hex)
+
+    @staticmethod
+    def _hash_password(password: str, salt: str) -> str:
+        """
+        Hashes a password with Argon2id using the given salt.
+
+        Args:
+            password (str): The password to hash.
+            salt (str): The salt, in hex.
+
+        Returns:
+            str: The Argon2id hash in PHC string format.
+        """
+        return password_hasher.hash(password, salt=bytes.fromhex(salt))
+
+    @staticmethod
+    def _verify_password(password: str, salt: str, hashed_password: str) -> bool:
+        """
+        Checks a password against a stored hash.
+
+        Hashes stored before the switch to Argon2id are salted SHA-256 digests
+        and are still accepted.
+
+        Args:
+            password (str): The password to check.
+            salt (str): The stored salt, in hex.
+            hashed_password (str): The stored hash.
+
+        Returns:
+            bool: True if the password matches, False otherwise.
+        """
+        if not hashed_password.startswith("$argon2"):
+            legacy_hash = hashlib.sha256(f"{password}{salt}".encode()).hexdigest()
+            return secrets.compare_digest(legacy_hash, hashed_password)
+        try:
+            return password_hasher.verify(hashed_password, password)
+        except (VerificationError, InvalidHashError):
+            return False
 
     @classmethod
     def _generate_hashed_password(cls, password: str) -> tuple[str, str]:
@@ -31,9 +105,8 @@ class Users(db.Model):
         Returns:
             tuple: A tuple containing the salt and hashed password.
         """
-        salt = os.urandom(16).hex()
-        hashed_password = hashlib.sha256((password + salt).encode()).hexdigest()
-        return salt, hashed_password
+        salt = secrets.token_hex(16)
+        return salt, cls._hash_password(password, salt)
 
     @classmethod
     def create_user(cls, username: str, password: str) -> None:
@@ -62,11 +135,53 @@ class Users(db.Model):
             logger.error("Database error: %s", str(e))
             raise
 
+    @classmethod
+    def create_users_bulk(cls, users: list[dict[str, str]]) -> None:
+        """
+        Create many users at once, hashing their passwords in parallel.
+
+        Argon2 runs in C without holding the GIL, so the hashes are computed on
+        a thread pool and the users are then written with a single INSERT. At most
+        BULK_HASH_WORKERS hashes run at once, so hashing needs at most
+        BULK_HASH_WORKERS * memory_cost KiB (4 * 64 MiB with the defaults).
+
+        Args:
+            users (list[dict]): The users to create, each with 'username' and 'password' keys.
+
+        Raises:
+            ValueError: If any of the usernames already exists.
+        """
+        if not users:
+            return
+
+        with ThreadPoolExecutor(max_workers=BULK_HASH_WORKERS) as executor:
+            hashed_passwords = list(executor.map(cls._generate_hashed_password, (user["password"] for user in users)))
+
+        rows = [
+            {"username": user["username"], "salt": salt, "password": hashed_password}
+            for user, (salt, hashed_password) in zip(users, hashed_passwords)
+        ]
+        try:
+            db.session.execute(insert(cls), rows)
+            db.session.commit()
+            logger.info("%d users successfully added to the database", len(rows))
+        except IntegrityError:
+            db.session.rollback()
+            logger.error("Duplicate username in bulk user creation")
+            raise ValueError("One or more usernames already exist")
+        except Exception as e:
+            db.session.rollback()
+            logger.error("Database error: %s", str(e))
+            raise
+
     @classmethod
     def check_password(cls, username: str, password: str) -> bool:
         """
         Check if a given password matches the stored password for a user.
 
+        On a successful check, a legacy SHA-256 hash or an Argon2id hash made
+        with outdated parameters is transparently replaced with a current one.
+
         Args:
             username (str): The username of the user.
             password (str): The password to check.
@@ -77,12 +192,29 @@ class Users(db.Model):
         Raises:
             ValueError: If the user does not exist.
         """
-        user = cls.query.filter_by(username=username).first()
-        if not user:
+        # Fetch only the salt and hash; a missing user costs exactly one query
+        row = db.session.execute(_SELECT_CREDENTIALS, {"name": username}).one_or_none()
+        if row is None:
+            # Spend the same KDF work as a real check so response time doesn't reveal valid usernames
+            try:
+                password_hasher.verify(_dummy_hash(), password)
+            except VerificationError:
+                pass
             logger.info("User %s not found", username)
             raise ValueError(f"User {username} not found")
-        hashed_password = hashlib.sha256((password + user.salt).encode()).hexdigest()
-        return hashed_password == user.password
+        salt, hashed_password = row
+        if not cls._verify_password(password, salt, hashed_password):
+            return False
+
+        if not hashed_password.startswith("$argon2") or password_hasher.check_needs_rehash(hashed_password):
+            logger.info("Upgrading password hash for user: %s", username)
+            new_salt, new_hashed_password = cls._generate_hashed_password(password)
+            db.session.execute(
+                _UPDATE_CREDENTIALS,
+                {"name": username, "new_salt": new_salt, "new_password": new_hashed_password},
+            )
+            db.session.commit()
+        return True
 
     @classmethod
     def delete_user(cls, username: str) -> None:
@@ -95,18 +227,20 @@ class Users(db.Model):
         Raises:
             ValueError: If the user does not exist.
         """
-        user = cls.query.filter_by(username=username).first()
-        if not user:
+        # A single DELETE both checks for the user and removes them
+        result = db.session.execute(_DELETE_USER, {"name": username})
+        if result.rowcount == 0:
+            db.session.rollback()
             logger.info("User %s not found", username)
             raise ValueError(f"User {username} not found")
-        db.session.delete(user)
         db.session.commit()
+        redis_client.delete(f"user_id:{username}")
         logger.info("User %s deleted successfully", username)
 
     @classmethod
     def get_id_by_username(cls, username: str) -> int:
         """
-        Retrieve the ID of a user by username.
+        Retrieve the ID of a user by username, using a cached association between username and ID.
 
         Args:
             username (str): The username of the user.
@@ -117,11 +251,24 @@ class Users(db.Model):
         Raises:
             ValueError: If the user does not exist.
         """
-        user = cls.query.filter_by(username=username).first()
-        if not user:
+        cache_key = f"user_id:{username}"
+
+        # Check if username-to-ID association is cached
+        user_id = redis_client.get(cache_key)
+        if user_id:
+            logger.info("User ID %s retrieved from cache for username: %s", user_id.decode(), username)
+            return int(user_id.decode())
+
+        # Fallback to database if cache miss; selecting only the ID lets the unique
+        # username index answer the query without reading the table row
+        user_id = db.session.execute(_SELECT_ID, {"name": username}).scalar_one_or_none()
+        if user_id is None:
             logger.info("User %s not found", username)
             raise ValueError(f"User {username} not found")
-        return user.id
+
+        logger.info("Caching user ID %s for username: %s", user_id, username)
+        redis_client.set(cache_key, str(user_id), ex=USER_ID_CACHE_TTL)
+        return user_id
 
     @classmethod
     def update_password(cls, username: str, new_password: str) -> None:
@@ -135,13 +282,27 @@ class Users(db.Model):
         Raises:
             ValueError: If the user does not exist.
         """
-        user = cls.query.filter_by(username=username).first()
-        if not user:
+        salt, hashed_password = cls._generate_hashed_password(new_password)
+        # A single UPDATE both checks for the user and stores the new hash
+        result = db.session.execute(
+            _UPDATE_CREDENTIALS,
+            {"name": username, "new_salt": salt, "new_password": hashed_password},
+        )
+        if result.rowcount == 0:
+            db.session.rollback()
             logger.info("User %s not found", username)
             raise ValueError(f"User {username} not found")
-
-        salt, hashed_password = cls._generate_hashed_password(new_password)
-        user.salt = salt
-        user.password = hashed_password
         db.session.commit()
-        logger.info("Password updated successfully for user: %s", username)
\ No newline at end of file
+        logger.info("Password updated successfully for user: %s", username)
+
+
+# Statements for the per-request lookups and writes, built once and run with bound parameters so each call
+# skips constructing the expression and hits SQLAlchemy's compiled-statement cache directly
+_SELECT_CREDENTIALS = select(Users.salt, Users.password).where(Users.username == bindparam("name"))
+_SELECT_ID = select(Users.id).where(Users.username == bindparam("name"))
+_UPDATE_CREDENTIALS = (
+    update(Users)
+    .where(Users.username == bindparam("name"))
+    .values(salt=bindparam("new_salt"), password=bindparam("new_password"))
+)
+_DELETE_USER = delete(Users).where(Users.username == bindparam("name"))
@@ -1,13 +1,33 @@
+import os
+
 import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+# Use the cheapest Argon2 cost profile; these must be set before the user model is imported
+os.environ.setdefault('ARGON2_TIME_COST', '1')
+os.environ.setdefault('ARGON2_MEMORY_COST', '8')
+os.environ.setdefault('ARGON2_PARALLELISM', '1')
 
 from app import create_app
 from config import TestConfig
 from meal_max.db import db
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def app():
+    # Build the app and schema once; each test is isolated by the rollback in `session` below
     app = create_app(TestConfig)
     with app.app_context():
+        # pysqlite defers BEGIN on its own, which breaks SAVEPOINTs; let SQLAlchemy emit it
+        @event.listens_for(db.engine, "connect")
+        def _disable_pysqlite_begin(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(db.engine, "begin")
+        def _emit_begin(conn):
+            conn.exec_driver_sql("BEGIN")
+
+        db.engine.dispose()
         db.create_all()
         yield app
         db.session.remove()
@@ -19,5 +39,15 @@ def client(app):
 
 @pytest.fixture
 def session(app):
-    with app.app_context():
-        yield db.session
\ No newline at end of file
+    # Run the test inside an outer transaction; commits and rollbacks only touch a SAVEPOINT
+    connection = db.engine.connect()
+    transaction = connection.begin()
+    original_session = db.session
+    db.session = scoped_session(sessionmaker(bind=connection, join_transaction_mode="create_savepoint"))
+    try:
+        yield db.session
+    finally:
+        db.session.remove()
+        db.session = original_session
+        transaction.rollback()
+        connection.close()
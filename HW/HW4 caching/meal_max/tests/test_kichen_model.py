@@ -1,12 +1,22 @@
 from dataclasses import asdict
+import json
 
 import pytest
+from redis.exceptions import WatchError
 
-from meal_max.models.kitchen_model import Meals
+from meal_max.models.kitchen_model import (
+    LEADERBOARD_CACHE_KEYS, LEADERBOARD_VERSION_KEY, Meals, _invalidate_local_meal_cache
+)
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
 def mock_redis_client(mocker):
-    return mocker.patch('meal_max.models.kitchen_model.redis_client')
+    # Every meal write touches the cache, so no test here may reach a real Redis
+    mock_redis_client = mocker.patch('meal_max.models.kitchen_model.redis_client')
+    mock_redis_client.get.return_value = None
+    mock_redis_client.mget.side_effect = lambda keys: [None] * len(keys)
+    # Meal IDs are reused across tests, so start each one with an empty in-process cache
+    _invalidate_local_meal_cache()
+    return mock_redis_client
 
 ######################################################
 #
@@ -65,8 +75,18 @@ def test_delete_meal_triggers_cache_delete(session, mock_redis_client):
     # Delete the meal
     Meals.delete_meal(meal.id)
 
-    # Check that the Redis cache entry was deleted
-    mock_redis_client.delete.assert_called_once_with(f"meal:{meal.id}")
+    # Check that the Redis cache entry was deleted along with the cached leaderboards
+    mock_pipeline = mock_redis_client.pipeline.return_value
+    mock_pipeline.delete.assert_called_with(f"meal:{meal.id}", *LEADERBOARD_CACHE_KEYS)
+    mock_pipeline.incr.assert_called_with(LEADERBOARD_VERSION_KEY)
+
+def test_delete_meal_already_deleted(session, mock_redis_client):
+    """Test deleting a meal that has already been deleted."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    meal = Meals.query.one()
+    Meals.delete_meal(meal.id)
+    with pytest.raises(ValueError, match=f"Meal with ID {meal.id} has been deleted"):
+        Meals.delete_meal(meal.id)
 
 def test_delete_meal_bad_id(session):
     """Test deleting a meal that does not exist."""
@@ -80,23 +100,24 @@ def test_get_meal_by_id_cache_hit(session, mock_redis_client):
     meal = Meals.query.one()
 
     # Set up mock Redis client to simulate cache hit with encoded data
-    mock_redis_client.hgetall.return_value = {
-        "id".encode(): "1".encode(),
-        "meal".encode(): "Spaghetti".encode(),
-        "cuisine".encode(): "Italian".encode(),
-        "price".encode(): "12.5".encode(),
-        "difficulty".encode(): "MED".encode(),
-        "battles".encode(): "0".encode(),
-        "wins".encode(): "0".encode(),
-        "deleted".encode(): "False".encode(),
-    }
+    mock_redis_client.get.return_value = json.dumps({
+        "id": 1,
+        "meal": "Spaghetti",
+        "cuisine": "Italian",
+        "price": 12.5,
+        "difficulty": "MED",
+        "battles": 0,
+        "wins": 0,
+        "deleted": False,
+    }).encode()
 
     # Call the method
     result = Meals.get_meal_by_id(meal.id)
 
     # Assert Redis cache was accessed and the result is correct
-    mock_redis_client.hgetall.assert_called_once_with(f"meal_1")
+    mock_redis_client.get.assert_called_once_with("meal:1")
     assert result["meal"] == "Spaghetti"
+    assert result["price"] == 12.5
 
 
 def test_get_meal_by_id_cache_miss(session, mock_redis_client):
@@ -105,34 +126,101 @@ def test_get_meal_by_id_cache_miss(session, mock_redis_client):
     Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
     meal = Meals.query.one()
 
-    # Simulate cache miss by setting return_value to an empty dictionary
-    mock_redis_client.hgetall.return_value = {}
+    # Simulate cache miss
+    mock_redis_client.get.return_value = None
 
     # Call the method
     result = Meals.get_meal_by_id(meal.id)
 
-    # Assert Redis cache was accessed and data was subsequently cached with hset
-    mock_redis_client.hgetall.assert_called_once_with(f"meal_{meal.id}")
-    mock_redis_client.hset.assert_called_once_with(
-        f"meal_1",
-        mapping={
-            "id": "1",
+    # Assert Redis cache was accessed and data was subsequently cached with set
+    mock_redis_client.get.assert_called_once_with(f"meal:{meal.id}")
+    mock_redis_client.set.assert_called_once_with(
+        "meal:1",
+        json.dumps({
+            "id": 1,
             "meal": "Spaghetti",
             "cuisine": "Italian",
-            "price": "12.5",
+            "price": 12.5,
             "difficulty": "MED",
-            "battles": "0",
-            "wins": "0",
-            "deleted": "False",
-        }
+            "battles": 0,
+            "wins": 0,
+            "deleted": False,
+        })
     )
     assert result["meal"] == "Spaghetti"
 
+def test_update_meal_then_get_meal_by_id_hits_cache(session, mock_redis_client):
+    """Test that get_meal_by_id reads the same cache entry it repopulates after an update."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    meal = Meals.query.one()
+    Meals.update_meal(meal.id, cuisine="Mexican")
+
+    # The update dropped the cached copy, so the first read reloads it from the database
+    assert Meals.get_meal_by_id(meal.id)["cuisine"] == "Mexican"
+    written_key, written_value = mock_redis_client.set.call_args.args
+
+    # Another worker, without the in-process copy, is then served from Redis
+    _invalidate_local_meal_cache()
+    mock_redis_client.get.side_effect = lambda key: written_value.encode() if key == written_key else None
+    result = Meals.get_meal_by_id(meal.id)
+    assert result["cuisine"] == "Mexican"
+    mock_redis_client.set.assert_called_once()
+
+def test_get_meal_by_id_local_cache_hit(session, mock_redis_client):
+    """Test that a repeated lookup is served from the in-process cache without Redis."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    meal = Meals.query.one()
+
+    first = Meals.get_meal_by_id(meal.id)
+    second = Meals.get_meal_by_id(meal.id)
+
+    assert second == first
+    mock_redis_client.get.assert_called_once_with(f"meal:{meal.id}")
+
+def test_update_meal_invalidates_local_cache(session, mock_redis_client):
+    """Test that updating a meal drops it from the in-process cache."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    meal = Meals.query.one()
+    Meals.get_meal_by_id(meal.id)
+
+    Meals.update_meal(meal.id, cuisine="Mexican")
+
+    assert Meals.get_meal_by_id(meal.id)["cuisine"] == "Mexican"
+
+def test_get_meals_by_ids(session, mock_redis_client):
+    """Test retrieving several meals with one Redis round trip, falling back to the database."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    Meals.create_meal("Tacos", "Mexican", 8.0, "LOW")
+    spaghetti, tacos = Meals.query.order_by(Meals.id).all()
+    mock_redis_client.pipeline.reset_mock()  # Ignore the cache warm from create_meal
+    mock_redis_client.mget.side_effect = None
+    mock_redis_client.mget.return_value = [json.dumps(asdict(tacos)).encode(), None]
+
+    result = Meals.get_meals_by_ids([tacos.id, spaghetti.id])
+
+    assert [meal["meal"] for meal in result] == ["Tacos", "Spaghetti"]
+    mock_redis_client.mget.assert_called_once_with([f"meal:{tacos.id}", f"meal:{spaghetti.id}"])
+    mock_redis_client.pipeline.return_value.set.assert_called_once_with(
+        f"meal:{spaghetti.id}", json.dumps(asdict(spaghetti))
+    )
+    mock_redis_client.get.assert_not_called()
+
+def test_get_meals_by_ids_skips_unavailable(session, mock_redis_client):
+    """Test that missing and deleted meals are left out of a batch lookup."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    Meals.create_meal("Tacos", "Mexican", 8.0, "LOW")
+    spaghetti, tacos = Meals.query.order_by(Meals.id).all()
+    Meals.delete_meal(tacos.id)
+
+    result = Meals.get_meals_by_ids([spaghetti.id, tacos.id, 999])
+
+    assert [meal["meal"] for meal in result] == ["Spaghetti"]
+
 def test_get_meal_by_id_bad_id(session, mock_redis_client):
     """Test retrieving a meal by an invalid ID."""
 
-    # Ensure the Redis client returns an empty dict to simulate a cache miss
-    mock_redis_client.hgetall.return_value = {}
+    # Ensure the Redis client returns nothing to simulate a cache miss
+    mock_redis_client.get.return_value = None
 
     with pytest.raises(ValueError, match="Meal 999 not found"):
         Meals.get_meal_by_id(999)
@@ -141,16 +229,16 @@ def test_get_meal_by_id_deleted(session, mock_redis_client):
     """Test retrieving a meal that has been marked as deleted."""
 
     # Set up the Redis client to return a deleted meal entry
-    mock_redis_client.hgetall.return_value = {
-        "id".encode(): "1".encode(),
-        "meal".encode(): "Spaghetti".encode(),
-        "cuisine".encode(): "Italian".encode(),
-        "price".encode(): "12.5".encode(),
-        "difficulty".encode(): "MED".encode(),
-        "battles".encode(): "10".encode(),
-        "wins".encode(): "5".encode(),
-        "deleted".encode(): "True".encode(),  # Simulate the meal being marked as deleted
-    }
+    mock_redis_client.get.return_value = json.dumps({
+        "id": 1,
+        "meal": "Spaghetti",
+        "cuisine": "Italian",
+        "price": 12.5,
+        "difficulty": "MED",
+        "battles": 10,
+        "wins": 5,
+        "deleted": True,  # Simulate the meal being marked as deleted
+    }).encode()
 
     with pytest.raises(ValueError, match="Meal 1 not found"):
         Meals.get_meal_by_id(1)
@@ -160,13 +248,26 @@ def test_get_meal_by_name_cache_hit(session, mock_redis_client):
     # Create the meal and cache the name-to-ID association
     Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
     meal = Meals.query.one()
-    mock_redis_client.get.return_value = str(meal.id).encode()  # Simulate name-to-ID cache hit
-    mock_redis_client.hgetall.return_value = {k.encode(): str(v).encode() for k, v in asdict(meal).items()}
+    _invalidate_local_meal_cache()  # Ignore the local cache warm from create_meal
+    # Simulate a cache hit for both the name-to-ID association and the meal data
+    cached = {"meal_name:Spaghetti": str(meal.id).encode(), f"meal:{meal.id}": json.dumps(asdict(meal)).encode()}
+    mock_redis_client.get.side_effect = cached.get
+
+    # Retrieve meal by name, expecting the name lookup followed by the meal lookup
+    result = Meals.get_meal_by_name("Spaghetti")
+    assert [c.args for c in mock_redis_client.get.call_args_list] == [("meal_name:Spaghetti",), (f"meal:{meal.id}",)]
+    assert result["meal"] == "Spaghetti"
+
+def test_get_meal_by_name_local_cache_hit(session, mock_redis_client):
+    """Test that a cached name resolves to a locally cached meal with one Redis lookup."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    meal = Meals.query.one()
+    Meals.get_meal_by_id(meal.id)  # Load the meal into the in-process cache
+    mock_redis_client.get.reset_mock()
+    mock_redis_client.get.return_value = str(meal.id).encode()
 
-    # Retrieve meal by name, expecting a cache hit for both ID and meal data
     result = Meals.get_meal_by_name("Spaghetti")
     mock_redis_client.get.assert_called_once_with("meal_name:Spaghetti")
-    mock_redis_client.hgetall.assert_called_once_with(f"meal_{meal.id}")
     assert result["meal"] == "Spaghetti"
 
 def test_get_meal_by_name_cache_miss(session, mock_redis_client):
@@ -174,14 +275,16 @@ def test_get_meal_by_name_cache_miss(session, mock_redis_client):
     # Create the meal but simulate a cache miss for name-to-ID association
     Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
     meal = Meals.query.one()
-    mock_redis_client.get.return_value = None  # Simulate cache miss for name-to-ID
-    mock_redis_client.hgetall.return_value = {}  # Simulate cache miss for meal data
+    mock_redis_client.pipeline.reset_mock()  # Ignore the cache warm from create_meal
 
     # Retrieve meal by name; expect DB lookup and caching of both ID and meal data
     result = Meals.get_meal_by_name("Spaghetti")
+    mock_pipeline = mock_redis_client.pipeline.return_value
+    mock_pipeline.set.assert_any_call("meal_name:Spaghetti", str(meal.id))
+    mock_pipeline.set.assert_any_call(f"meal:{meal.id}", json.dumps(asdict(meal)))
+    mock_pipeline.execute.assert_called_once()
+    # The meal already loaded from the database is returned without a second lookup
     mock_redis_client.get.assert_called_once_with("meal_name:Spaghetti")
-    mock_redis_client.set.assert_called_once_with("meal_name:Spaghetti", str(meal.id))
-    mock_redis_client.hset.assert_called_once_with(f"meal_{meal.id}", mapping={k: str(v) for k, v in asdict(meal).items()})
     assert result["meal"] == "Spaghetti"
 
 def test_get_meal_by_name_deleted(session, mock_redis_client):
@@ -192,17 +295,16 @@ def test_get_meal_by_name_deleted(session, mock_redis_client):
     Meals.delete_meal(meal.id)
 
     # Cache reflects that the meal is deleted
-    mock_redis_client.get.return_value = str(meal.id).encode()
-    mock_redis_client.hgetall.return_value = {
-        "id".encode(): "1".encode(),
-        "meal".encode(): "Spaghetti".encode(),
-        "cuisine".encode(): "Italian".encode(),
-        "price".encode(): "12.5".encode(),
-        "difficulty".encode(): "MED".encode(),
-        "battles".encode(): "0".encode(),
-        "wins".encode(): "0".encode(),
-        "deleted".encode(): "True".encode()
-    }
+    mock_redis_client.get.side_effect = {"meal_name:Spaghetti": str(meal.id).encode(), f"meal:{meal.id}": json.dumps({
+        "id": 1,
+        "meal": "Spaghetti",
+        "cuisine": "Italian",
+        "price": 12.5,
+        "difficulty": "MED",
+        "battles": 0,
+        "wins": 0,
+        "deleted": True,
+    }).encode()}.get
 
     # Attempt retrieval, expecting a ValueError
     with pytest.raises(ValueError, match="Meal Spaghetti not found"):
@@ -210,10 +312,7 @@ def test_get_meal_by_name_deleted(session, mock_redis_client):
 
 def test_get_meal_by_name_bad_name(session, mock_redis_client):
     """Test retrieving a meal by a name that does not exist in cache or database."""
-    # Simulate a cache miss for a non-existent meal name
-    mock_redis_client.get.return_value = None
-
-    # Attempt retrieval, expecting a ValueError
+    # The fixture's Redis mock misses every key, so the lookup falls through to the database
     with pytest.raises(ValueError, match="Meal Motor oil not found"):
         Meals.get_meal_by_name("Motor oil")
     mock_redis_client.get.assert_called_once_with("meal_name:Motor oil")
@@ -229,7 +328,7 @@ def test_update_meal(session, mock_redis_client):
     assert updated_meal.difficulty == "HIGH"
 
 def test_update_meal_triggers_cache_update(session, mock_redis_client):
-    """Test that updating a meal triggers a cache update in Redis."""
+    """Test that updating a meal invalidates its Redis cache entry."""
     # Create and add a meal
     Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
     meal = session.get(Meals, 1)
@@ -237,20 +336,10 @@ def test_update_meal_triggers_cache_update(session, mock_redis_client):
     # Update the meal
     Meals.update_meal(meal.id, cuisine="Mexican", price=15.0)
 
-    # Check that the Redis cache was updated with the new values
-    mock_redis_client.hset.assert_called_once_with(
-        f"meal:{meal.id}",
-        mapping={
-            b"id": b"1",
-            b"meal": b"Spaghetti",
-            b"cuisine": b"Mexican",
-            b"price": b"15.0",
-            b"difficulty": b"MED",
-            b"battles": b"0",
-            b"wins": b"0",
-            b"deleted": b"False",
-        }
-    )
+    # Check that the stale Redis cache entry was dropped along with the cached leaderboards
+    mock_pipeline = mock_redis_client.pipeline.return_value
+    mock_pipeline.delete.assert_called_with(f"meal:{meal.id}", *LEADERBOARD_CACHE_KEYS)
+    mock_pipeline.incr.assert_called_with(LEADERBOARD_VERSION_KEY)
 
 def test_update_meal_deleted(session, mock_redis_client):
     """Test updating a deleted meal."""
@@ -267,6 +356,15 @@ def test_update_meal_update_name(session):
     with pytest.raises(ValueError, match="Cannot update meal name"):
         Meals.update_meal(meal.id, meal="Lasagna", cuisine="Italian", price=15.0, difficulty="HIGH")
 
+def test_update_meal_bad_attribute(session):
+    """Test updating an attribute that is not updatable."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    meal = Meals.query.one()
+    with pytest.raises(ValueError, match="Invalid attribute: id"):
+        Meals.update_meal(meal.id, id=42)
+    with pytest.raises(ValueError, match="Invalid attribute: calories"):
+        Meals.update_meal(meal.id, calories=500)
+
 def test_update_meal_bad_id(session):
     """Test updating a meal with an invalid ID."""
     with pytest.raises(ValueError, match="Meal 999 not found"):
@@ -299,6 +397,7 @@ def test_update_meal_stats_win(session, mock_redis_client):
     updated_meal = Meals.query.one()
     assert updated_meal.wins == 1
     assert updated_meal.battles == 1
+    mock_redis_client.pipeline.return_value.delete.assert_called_with(f"meal:{meal.id}", *LEADERBOARD_CACHE_KEYS)
 
 def test_update_meal_stats_loss(session, mock_redis_client):
     """Test updating the meal stats for a loss."""
@@ -309,6 +408,19 @@ def test_update_meal_stats_loss(session, mock_redis_client):
     assert updated_meal.wins == 0
     assert updated_meal.battles == 1
 
+def test_update_meal_stats_deleted(session, mock_redis_client):
+    """Test updating the stats of a deleted meal."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    meal = Meals.query.one()
+    Meals.delete_meal(meal.id)
+    with pytest.raises(ValueError, match="Meal 1 has been deleted"):
+        Meals.update_meal_stats(meal.id, 'win')
+
+def test_update_meal_stats_bad_id(session, mock_redis_client):
+    """Test updating the stats of a meal that does not exist."""
+    with pytest.raises(ValueError, match="Meal 999 not found"):
+        Meals.update_meal_stats(999, 'win')
+
 def test_get_leaderboard(session):
     """Test retrieving the leaderboard sorted by wins."""
     Meals.create_meal("Spaghetti", "Italian", 12.5, "MED", battles=10, wins=7)
@@ -326,6 +438,65 @@ def test_get_leaderboard_sort_pct(session):
     leaderboard = Meals.get_leaderboard(sort_by="win_pct")
     assert leaderboard[0]["meal"] == "Spaghetti"
     assert leaderboard[1]["meal"] == "Pizza"
+    assert leaderboard[0]["win_pct"] == 70.0
+    assert leaderboard[1]["win_pct"] == 62.5
+
+def test_get_leaderboard_cached(session, mock_redis_client):
+    """Test that a computed leaderboard is cached and served from the cache."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED", battles=10, wins=7)
+
+    mock_pipeline = mock_redis_client.pipeline.return_value
+    mock_pipeline.get.return_value = None  # No invalidation since the version was read
+
+    leaderboard = Meals.get_leaderboard()
+    mock_pipeline.watch.assert_called_once_with(LEADERBOARD_VERSION_KEY)
+    mock_pipeline.set.assert_called_with("leaderboard:wins", json.dumps(leaderboard), ex=60)
+
+    mock_redis_client.get.return_value = json.dumps(leaderboard).encode()
+    assert Meals.get_leaderboard() == leaderboard
+
+def test_add_meal_invalidates_leaderboard(session, mock_redis_client):
+    """Test that adding a meal invalidates the cached leaderboards."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    mock_redis_client.pipeline.return_value.delete.assert_called_once_with(*LEADERBOARD_CACHE_KEYS)
+    mock_redis_client.pipeline.return_value.incr.assert_called_once_with(LEADERBOARD_VERSION_KEY)
+
+def test_get_leaderboard_not_cached_after_concurrent_write(session, mock_redis_client):
+    """Test that a leaderboard queried before a battle was recorded is not cached after it."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED", battles=10, wins=7)
+    mock_pipeline = mock_redis_client.pipeline.return_value
+    mock_pipeline.reset_mock()
+
+    # The reader sees version 1 before its query; a battle is recorded (and the version
+    # bumped to 2) before the reader gets to cache its result
+    mock_redis_client.get.side_effect = {LEADERBOARD_VERSION_KEY: b"1"}.get
+    mock_pipeline.get.return_value = b"2"
+
+    leaderboard = Meals.get_leaderboard()
+    assert leaderboard[0]["meal"] == "Spaghetti"
+    mock_pipeline.multi.assert_not_called()
+    mock_pipeline.set.assert_not_called()
+
+def test_get_leaderboard_not_cached_when_watch_fails(session, mock_redis_client):
+    """Test that a write landing between the version check and the SET is not an error."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED", battles=10, wins=7)
+    mock_pipeline = mock_redis_client.pipeline.return_value
+    mock_pipeline.get.return_value = None
+    mock_pipeline.execute.side_effect = WatchError()
+
+    leaderboard = Meals.get_leaderboard()
+    assert leaderboard[0]["meal"] == "Spaghetti"
+    mock_pipeline.reset.assert_called()
+
+def test_add_meal_warms_cache(session, mock_redis_client):
+    """Test that adding a meal caches its name-to-ID association and data in one round trip."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    meal = Meals.query.one()
+
+    mock_pipeline = mock_redis_client.pipeline.return_value
+    mock_pipeline.set.assert_any_call("meal_name:Spaghetti", str(meal.id))
+    mock_pipeline.set.assert_any_call(f"meal:{meal.id}", json.dumps(asdict(meal)))
+    mock_pipeline.execute.assert_called_once()
 
 def test_get_leaderboard_bad_sort():
     """Test retrieving the leaderboard with an invalid sort option."""
@@ -1,6 +1,6 @@
 import pytest
 
-from meal_max.models.mongo_session_model import login_user, logout_user
+from meal_max.models.mongo_session_model import create_session_indexes, login_user, logout_user
 
 @pytest.fixture
 def sample_user_id():
@@ -9,7 +9,7 @@ def sample_user_id():
 
 @pytest.fixture
 def sample_combatants():
-    return [{"meal_id": 1}, {"meal_id": 2}]  # Sample combatant data
+    return [1, 2]  # Sample combatant data, stored as meal IDs
 
 
 def test_login_user_creates_session_if_not_exists(mocker, sample_user_id):
@@ -20,7 +20,7 @@ def test_login_user_creates_session_if_not_exists(mocker, sample_user_id):
 
     login_user(sample_user_id, mock_battle_model)
 
-    mock_find.assert_called_once_with({"user_id": sample_user_id})
+    mock_find.assert_called_once_with({"user_id": sample_user_id}, {"_id": 0, "combatants": 1})
     mock_insert.assert_called_once_with({"user_id": sample_user_id, "combatants": []})
     mock_battle_model.clear_combatants.assert_not_called()
     mock_battle_model.prep_combatant.assert_not_called()
@@ -31,13 +31,36 @@ def test_login_user_loads_combatants_if_session_exists(mocker, sample_user_id, s
         "meal_max.clients.mongo_client.sessions_collection.find_one",
         return_value={"user_id": sample_user_id, "combatants": sample_combatants}
     )
+    meals = [{"id": 1, "meal": "Spaghetti"}, {"id": 2, "meal": "Tacos"}]
+    mock_get_meals = mocker.patch("meal_max.models.kitchen_model.Meals.get_meals_by_ids", return_value=meals)
     mock_battle_model = mocker.Mock()
 
     login_user(sample_user_id, mock_battle_model)
 
-    mock_find.assert_called_once_with({"user_id": sample_user_id})
+    mock_find.assert_called_once_with({"user_id": sample_user_id}, {"_id": 0, "combatants": 1})
+    mock_get_meals.assert_called_once_with(sample_combatants)
     mock_battle_model.clear_combatants.assert_called_once()
-    mock_battle_model.prep_combatant.assert_has_calls([mocker.call(combatant) for combatant in sample_combatants])
+    mock_battle_model.prep_combatant.assert_has_calls([mocker.call(meal) for meal in meals])
+
+def test_login_user_loads_session_without_combatants(mocker, sample_user_id):
+    """Test login_user treats a session projected down to no fields as existing."""
+    mocker.patch("meal_max.clients.mongo_client.sessions_collection.find_one", return_value={})
+    mock_insert = mocker.patch("meal_max.clients.mongo_client.sessions_collection.insert_one")
+    mock_battle_model = mocker.Mock()
+
+    login_user(sample_user_id, mock_battle_model)
+
+    mock_insert.assert_not_called()
+    mock_battle_model.clear_combatants.assert_called_once()
+    mock_battle_model.prep_combatant.assert_not_called()
+
+def test_create_session_indexes(mocker):
+    """Test that sessions are indexed by user ID."""
+    mock_create_index = mocker.patch("meal_max.clients.mongo_client.sessions_collection.create_index")
+
+    create_session_indexes()
+
+    mock_create_index.assert_called_once_with("user_id", unique=True)
 
 def test_logout_user_updates_combatants(mocker, sample_user_id, sample_combatants):
     """Test logout_user updates the combatants list in the session."""
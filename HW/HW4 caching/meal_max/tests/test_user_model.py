@@ -1,8 +1,16 @@
+import hashlib
+
 import pytest
+from sqlalchemy import select
 
+from meal_max.models import user_model
 from meal_max.models.user_model import Users
 
 
+@pytest.fixture
+def mock_redis_client(mocker):
+    return mocker.patch('meal_max.models.user_model.redis_client')
+
 @pytest.fixture
 def sample_user():
     return {
@@ -22,7 +30,7 @@ def test_create_user(session, sample_user):
     assert user is not None, "User should be created in the database."
     assert user.username == sample_user["username"], "Username should match the input."
     assert len(user.salt) == 32, "Salt should be 32 characters (hex)."
-    assert len(user.password) == 64, "Password should be a 64-character SHA-256 hash."
+    assert user.password.startswith("$argon2id$"), "Password should be an Argon2id hash."
 
 def test_create_duplicate_user(session, sample_user):
     """Test attempting to create a user with a duplicate username."""
@@ -30,6 +38,23 @@ def test_create_duplicate_user(session, sample_user):
     with pytest.raises(ValueError, match="User with username 'testuser' already exists"):
         Users.create_user(**sample_user)
 
+def test_create_users_bulk(session):
+    """Test creating several users in one call."""
+    users = [{"username": f"user{i}", "password": f"password{i}"} for i in range(4)]
+    Users.create_users_bulk(users)
+
+    assert session.query(Users).count() == 4, "All users should be created in the database."
+    for user in users:
+        assert Users.check_password(user["username"], user["password"]) is True, "Password should match."
+
+def test_create_users_bulk_duplicate(session, sample_user):
+    """Test that a bulk creation containing an existing username creates no users."""
+    Users.create_user(**sample_user)
+    with pytest.raises(ValueError, match="One or more usernames already exist"):
+        Users.create_users_bulk([{"username": "newuser", "password": "pw"}, sample_user])
+
+    assert session.query(Users).count() == 1, "No new users should be created."
+
 ##########################################################
 # User Authentication
 ##########################################################
@@ -44,11 +69,32 @@ def test_check_password_incorrect(session, sample_user):
     Users.create_user(**sample_user)
     assert Users.check_password(sample_user["username"], "wrongpassword") is False, "Password should not match."
 
+def test_check_password_upgrades_legacy_hash(session, sample_user):
+    """Test that a correct password stored as a legacy SHA-256 hash is upgraded to Argon2id."""
+    salt = "0" * 32
+    legacy_hash = hashlib.sha256((sample_user["password"] + salt).encode()).hexdigest()
+    session.add(Users(username=sample_user["username"], salt=salt, password=legacy_hash))
+    session.commit()
+
+    assert Users.check_password(sample_user["username"], "wrongpassword") is False, "Password should not match."
+    assert Users.check_password(sample_user["username"], sample_user["password"]) is True, "Password should match."
+
+    user = session.query(Users).filter_by(username=sample_user["username"]).first()
+    assert user.password.startswith("$argon2id$"), "Legacy hash should be upgraded to Argon2id."
+    assert Users.check_password(sample_user["username"], sample_user["password"]) is True, "Upgraded password should match."
+
 def test_check_password_user_not_found(session):
     """Test checking password for a non-existent user."""
     with pytest.raises(ValueError, match="User nonexistentuser not found"):
         Users.check_password("nonexistentuser", "password")
 
+def test_check_password_user_not_found_runs_dummy_verify(session, mocker):
+    """Test that a non-existent user still pays for a full password verification."""
+    mock_hasher = mocker.patch.object(user_model, "password_hasher", wraps=user_model.password_hasher)
+    with pytest.raises(ValueError, match="User nonexistentuser not found"):
+        Users.check_password("nonexistentuser", "password")
+    mock_hasher.verify.assert_called_once_with(user_model._dummy_hash(), "password")
+
 ##########################################################
 # Update Password
 ##########################################################
@@ -70,12 +116,13 @@ def test_update_password_user_not_found(session):
 # Delete User
 ##########################################################
 
-def test_delete_user(session, sample_user):
+def test_delete_user(session, sample_user, mock_redis_client):
     """Test deleting an existing user."""
     Users.create_user(**sample_user)
     Users.delete_user(sample_user["username"])
-    user = session.query(Users).filter_by(username=sample_user["username"]).first()
-    assert user is None, "User should be deleted from the database."
+    user_id = session.execute(select(Users.id).filter_by(username=sample_user["username"])).scalar_one_or_none()
+    assert user_id is None, "User should be deleted from the database."
+    mock_redis_client.delete.assert_called_once_with(f"user_id:{sample_user['username']}")
 
 def test_delete_user_not_found(session):
     """Test deleting a non-existent user."""
@@ -86,25 +133,40 @@ def test_delete_user_not_found(session):
 # Get User
 ##########################################################
 
-def test_get_id_by_username(session, sample_user):
+def test_get_id_by_username(session, sample_user, mock_redis_client):
     """
     Test successfully retrieving a user's ID by their username.
     """
     # Create a user in the database
     Users.create_user(**sample_user)
+    mock_redis_client.get.return_value = None  # Simulate cache miss for username-to-ID
 
     # Retrieve the user ID
     user_id = Users.get_id_by_username(sample_user["username"])
 
     # Verify the ID is correct
-    user = session.query(Users).filter_by(username=sample_user["username"]).first()
-    assert user is not None, "User should exist in the database."
-    assert user.id == user_id, "Retrieved ID should match the user's ID."
+    db_user_id = session.execute(select(Users.id).filter_by(username=sample_user["username"])).scalar_one_or_none()
+    assert db_user_id is not None, "User should exist in the database."
+    assert db_user_id == user_id, "Retrieved ID should match the user's ID."
+    mock_redis_client.set.assert_called_once_with(f"user_id:{sample_user['username']}", str(user_id), ex=60)
+
+def test_get_id_by_username_cache_hit(session, mock_redis_client):
+    """
+    Test retrieving a user's ID from the cache without querying the database.
+    """
+    mock_redis_client.get.return_value = b"7"  # Simulate username-to-ID cache hit
+
+    user_id = Users.get_id_by_username("cacheduser")
+
+    assert user_id == 7, "Retrieved ID should come from the cache."
+    mock_redis_client.get.assert_called_once_with("user_id:cacheduser")
+    mock_redis_client.set.assert_not_called()
 
 
-def test_get_id_by_username_user_not_found(session):
+def test_get_id_by_username_user_not_found(session, mock_redis_client):
     """
     Test failure when retrieving a non-existent user's ID by their username.
     """
+    mock_redis_client.get.return_value = None
     with pytest.raises(ValueError, match="User nonexistentuser not found"):
         Users.get_id_by_username("nonexistentuser")
@@ -1,5 +1,8 @@
+from typing import Any
+
 from dotenv import load_dotenv
-from flask import Flask, jsonify, make_response, Response, request
+from flask import Flask, Response, request
+import orjson
 # from flask_cors import CORS
 
 from meal_max.models import kitchen_model
@@ -19,6 +22,40 @@ app = Flask(__name__)
 # Initialize the BattleModel
 battle_model = BattleModel()
 
+# Accepted meal difficulty levels
+_DIFFICULTIES = frozenset(('HIGH', 'MED', 'LOW'))
+
+
+def json_response(payload: Any, status: int = 200) -> Response:
+    """
+    Build a JSON response, serialized with orjson rather than Flask's jsonify.
+
+    orjson serializes dataclasses such as Meal natively, so meals and combatants
+    can be passed in as they are.
+
+    Args:
+        payload (Any): The data to serialize.
+        status (int): The HTTP status code. Defaults to 200.
+
+    Returns:
+        Response: The JSON response.
+    """
+    return Response(orjson.dumps(payload), status=status, mimetype='application/json')
+
+def read_json() -> Any:
+    """
+    Parse the request body as JSON with orjson rather than request.get_json.
+
+    The body is read without being cached on the request, since nothing reads it twice.
+
+    Returns:
+        Any: The parsed JSON value.
+
+    Raises:
+        orjson.JSONDecodeError: If the body is not valid JSON.
+    """
+    return orjson.loads(request.get_data(cache=False))
+
 ####################################################
 #
 # Healthchecks
@@ -35,7 +72,7 @@ def healthcheck() -> Response:
         JSON response indicating the health status of the service.
     """
     app.logger.info('Health check')
-    return make_response(jsonify({'status': 'healthy'}), 200)
+    return json_response({'status': 'healthy'}, 200)
 
 @app.route('/api/db-check', methods=['GET'])
 def db_check() -> Response:
@@ -54,9 +91,9 @@ def db_check() -> Response:
         app.logger.info("Checking if meals table exists...")
         check_table_exists("meals")
         app.logger.info("meals table exists.")
-        return make_response(jsonify({'database_status': 'healthy'}), 200)
+        return json_response({'database_status': 'healthy'}, 200)
     except Exception as e:
-        return make_response(jsonify({'error': str(e)}), 404)
+        return json_response({'error': str(e)}, 404)
 
 
 ##########################################################
@@ -86,7 +123,10 @@ def add_meal() -> Response:
     app.logger.info('Creating new meal')
     try:
         # Get the JSON data from the request
-        data = request.get_json()
+        try:
+            data = read_json()
+        except orjson.JSONDecodeError:
+            return json_response({'error': 'Request body must be valid JSON'}, 400)
 
         # Extract and validate required fields
         meal = data.get('meal')
@@ -94,26 +134,28 @@ def add_meal() -> Response:
         price = data.get('price')
         difficulty = data.get('difficulty')
 
-        if not meal or not cuisine or price is None or difficulty not in ['HIGH', 'MED', 'LOW']:
-            return make_response(jsonify({'error': 'Invalid input, all fields are required with valid values'}), 400)
+        if not meal or not cuisine or price is None or difficulty not in _DIFFICULTIES:
+            return json_response({'error': 'Invalid input, all fields are required with valid values'}, 400)
 
-        # Check that price is a float and has at most two decimal places
+        # Check that price is a float and has at most two decimal places, by comparing it
+        # in whole cents rather than testing floats for exact equality
         try:
             price = float(price)
-            if round(price, 2) != price:
+            cents = price * 100
+            if abs(round(cents) - cents) > 1e-6:
                 raise ValueError("Price has more than two decimal places")
-        except ValueError as e:
-            return make_response(jsonify({'error': 'Price must be a valid float with at most two decimal places'}), 400)
+        except (ValueError, OverflowError):
+            return json_response({'error': 'Price must be a valid float with at most two decimal places'}, 400)
 
         # Call the kitchen_model function to add the combatant to the database
         app.logger.info('Adding meal: %s, %s, %.2f, %s', meal, cuisine, price, difficulty)
         kitchen_model.create_meal(meal, cuisine, price, difficulty)
 
         app.logger.info("Combatant added: %s", meal)
-        return make_response(jsonify({'status': 'success', 'combatant': meal}), 201)
+        return json_response({'status': 'success', 'combatant': meal}, 201)
     except Exception as e:
         app.logger.error("Failed to add combatant: %s", str(e))
-        return make_response(jsonify({'error': str(e)}), 500)
+        return json_response({'error': str(e)}, 500)
 
 @app.route('/api/clear-meals', methods=['DELETE'])
 def clear_catalog() -> Response:
@@ -126,10 +168,10 @@ def clear_catalog() -> Response:
     try:
         app.logger.info("Clearing the meals")
         kitchen_model.clear_meals()
-        return make_response(jsonify({'status': 'success'}), 200)
+        return json_response({'status': 'success'}, 200)
     except Exception as e:
         app.logger.error(f"Error clearing catalog: {e}")
-        return make_response(jsonify({'error': str(e)}), 500)
+        return json_response({'error': str(e)}, 500)
 
 @app.route('/api/delete-meal/<int:meal_id>', methods=['DELETE'])
 def delete_meal(meal_id: int) -> Response:
@@ -146,10 +188,10 @@ def delete_meal(meal_id: int) -> Response:
         app.logger.info(f"Deleting meal by ID: {meal_id}")
 
         kitchen_model.delete_meal(meal_id)
-        return make_response(jsonify({'status': 'success'}), 200)
+        return json_response({'status': 'success'}, 200)
     except Exception as e:
         app.logger.error(f"Error deleting meal: {e}")
-        return make_response(jsonify({'error': str(e)}), 500)
+        return json_response({'error': str(e)}, 500)
 
 @app.route('/api/get-meal-by-id/<int:meal_id>', methods=['GET'])
 def get_meal_by_id(meal_id: int) -> Response:
@@ -166,10 +208,10 @@ def get_meal_by_id(meal_id: int) -> Response:
         app.logger.info(f"Retrieving meal by ID: {meal_id}")
 
         meal = kitchen_model.get_meal_by_id(meal_id)
-        return make_response(jsonify({'status': 'success', 'meal': meal}), 200)
+        return json_response({'status': 'success', 'meal': meal}, 200)
     except Exception as e:
         app.logger.error(f"Error retrieving meal by ID: {e}")
-        return make_response(jsonify({'error': str(e)}), 500)
+        return json_response({'error': str(e)}, 500)
 
 @app.route('/api/get-meal-by-name/<string:meal_name>', methods=['GET'])
 def get_meal_by_name(meal_name: str) -> Response:
@@ -186,13 +228,13 @@ def get_meal_by_name(meal_name: str) -> Response:
         app.logger.info(f"Retrieving meal by name: {meal_name}")
 
         if not meal_name:
-            return make_response(jsonify({'error': 'Meal name is required'}), 400)
+            return json_response({'error': 'Meal name is required'}, 400)
 
         meal = kitchen_model.get_meal_by_name(meal_name)
-        return make_response(jsonify({'status': 'success', 'meal': meal}), 200)
+        return json_response({'status': 'success', 'meal': meal}, 200)
     except Exception as e:
         app.logger.error(f"Error retrieving meal by name: {e}")
-        return make_response(jsonify({'error': str(e)}), 500)
+        return json_response({'error': str(e)}, 500)
 
 
 ############################################################
@@ -217,10 +259,10 @@ def battle() -> Response:
 
         winner = battle_model.battle()
 
-        return make_response(jsonify({'status': 'success', 'winner': winner}), 200)
+        return json_response({'status': 'success', 'winner': winner}, 200)
     except Exception as e:
         app.logger.error(f"Battle error: {e}")
-        return make_response(jsonify({'error': str(e)}), 500)
+        return json_response({'error': str(e)}, 500)
 
 @app.route('/api/clear-combatants', methods=['POST'])
 def clear_combatants() -> Response:
@@ -236,10 +278,10 @@ def clear_combatants() -> Response:
         app.logger.info('Clearing all combatants...')
         battle_model.clear_combatants()
         app.logger.info('Combatants cleared.')
-        return make_response(jsonify({'status': 'success'}), 200)
+        return json_response({'status': 'success'}, 200)
     except Exception as e:
         app.logger.error("Failed to clear combatants: %s", str(e))
-        return make_response(jsonify({'error': str(e)}), 500)
+        return json_response({'error': str(e)}, 500)
 
 @app.route('/api/get-combatants', methods=['GET'])
 def get_combatants() -> Response:
@@ -252,10 +294,10 @@ def get_combatants() -> Response:
     try:
         app.logger.info('Getting combatants...')
         combatants = battle_model.get_combatants()
-        return make_response(jsonify({'status': 'success', 'combatants': combatants}), 200)
+        return json_response({'status': 'success', 'combatants': combatants}, 200)
     except Exception as e:
         app.logger.error("Failed to get combatants: %s", str(e))
-        return make_response(jsonify({'error': str(e)}), 500)
+        return json_response({'error': str(e)}, 500)
 
 @app.route('/api/prep-combatant', methods=['POST'])
 def prep_combatant() -> Response:
@@ -271,12 +313,15 @@ def prep_combatant() -> Response:
         500 error if there is an issue preparing combatants.
     """
     try:
-        data = request.json
+        try:
+            data = read_json()
+        except orjson.JSONDecodeError:
+            return json_response({'error': 'Request body must be valid JSON'}, 400)
         meal = data.get('meal')
         app.logger.info("Preparing combatant: %s", meal)
 
         if not meal:
-            return make_response(jsonify({'error': 'You must name a combatant'}), 400)
+            return json_response({'error': 'You must name a combatant'}, 400)
 
         try:
             meal = kitchen_model.get_meal_by_name(meal)
@@ -284,12 +329,12 @@ def prep_combatant() -> Response:
             combatants = battle_model.get_combatants()
         except Exception as e:
             app.logger.error("Failed to prepare combatant: %s", str(e))
-            return make_response(jsonify({'error': str(e)}), 500)
-        return make_response(jsonify({'status': 'success', 'combatants': combatants}), 200)
+            return json_response({'error': str(e)}, 500)
+        return json_response({'status': 'success', 'combatants': combatants}, 200)
 
     except Exception as e:
         app.logger.error("Failed to prepare combatants: %s", str(e))
-        return make_response(jsonify({'error': str(e)}), 500)
+        return json_response({'error': str(e)}, 500)
 
 
 ############################################################
@@ -318,10 +363,10 @@ def get_leaderboard() -> Response:
 
         leaderboard_data = kitchen_model.get_leaderboard(sort_by)
 
-        return make_response(jsonify({'status': 'success', 'leaderboard': leaderboard_data}), 200)
+        return json_response({'status': 'success', 'leaderboard': leaderboard_data}, 200)
     except Exception as e:
         app.logger.error(f"Error generating leaderboard: {e}")
-        return make_response(jsonify({'error': str(e)}), 500)
+        return json_response({'error': str(e)}, 500)
 
 
 
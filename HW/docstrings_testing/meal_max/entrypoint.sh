@@ -13,5 +13,8 @@ else
     echo "Skipping database creation."
 fi
 
-# Start the Python application
-exec python app.py
+# Start the application under gunicorn. The combatants being prepped for a battle live in
+# the worker's memory, so everything must be served by one worker process; concurrency
+# comes from its thread pool instead, which is enough since requests mostly wait on SQLite.
+exec gunicorn --bind 0.0.0.0:5000 --workers 1 --worker-class gthread \
+    --threads "${GUNICORN_THREADS:-8}" app:app
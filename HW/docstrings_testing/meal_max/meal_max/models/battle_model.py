@@ -1,7 +1,8 @@
 import logging
+import threading
 from typing import List
 
-from meal_max.models.kitchen_model import Meal, update_meal_stats
+from meal_max.models.kitchen_model import Meal, apply_battle_result
 from meal_max.utils.logger import configure_logger
 from meal_max.utils.random_utils import get_random
 
@@ -9,97 +10,88 @@ from meal_max.utils.random_utils import get_random
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
+# Subtracted from a combatant's battle score; harder meals lose less
+_DIFFICULTY_MODIFIER = {"HIGH": 1, "MED": 2, "LOW": 3}
+
 
 class BattleModel:
 
     def __init__(self):
         self.combatants: List[Meal] = []
+        # The app serves requests from a thread pool, so every change to combatants holds this
+        # lock; otherwise two battles could both score the same pair and record it twice
+        self._lock = threading.Lock()
 
     def battle(self) -> str:
         logger.info("Two meals enter, one meal leaves!")
 
-        if len(self.combatants) < 2:
-            logger.error("Not enough combatants to start a battle.")
-            raise ValueError("Two combatants must be prepped for a battle.")
-
-        combatant_1 = self.combatants[0]
-        combatant_2 = self.combatants[1]
-
-        # Log the start of the battle
-        logger.info("Battle started between %s and %s", combatant_1.meal, combatant_2.meal)
+        with self._lock:
+            if len(self.combatants) < 2:
+                logger.error("Not enough combatants to start a battle.")
+                raise ValueError("Two combatants must be prepped for a battle.")
 
-        # Get battle scores for both combatants
-        score_1 = self.get_battle_score(combatant_1)
-        score_2 = self.get_battle_score(combatant_2)
+            combatant_1 = self.combatants[0]
+            combatant_2 = self.combatants[1]
 
-        # Log the scores for both combatants
-        logger.info("Score for %s: %.3f", combatant_1.meal, score_1)
-        logger.info("Score for %s: %.3f", combatant_2.meal, score_2)
+            # Get battle scores for both combatants
+            score_1 = self.get_battle_score(combatant_1)
+            score_2 = self.get_battle_score(combatant_2)
 
-        # Compute the delta and normalize between 0 and 1
-        delta = abs(score_1 - score_2) / 100
+            # Compute the delta and normalize between 0 and 1
+            delta = abs(score_1 - score_2) / 100
 
-        # Log the delta and normalized delta
-        logger.info("Delta between scores: %.3f", delta)
+            # Get a random number to decide the battle
+            random_number = get_random()
 
-        # Get random number from random.org
-        random_number = get_random()
+            # Log the battle's numbers in one line; dropped unformatted below DEBUG
+            logger.debug("Scores: %s=%.3f, %s=%.3f; delta=%.3f, random number=%.3f",
+                         combatant_1.meal, score_1, combatant_2.meal, score_2, delta, random_number)
 
-        # Log the random number
-        logger.info("Random number from random.org: %.3f", random_number)
+            # Determine the winner based on the normalized delta
+            winner, loser = (combatant_1, combatant_2) if delta > random_number else (combatant_2, combatant_1)
 
-        # Determine the winner based on the normalized delta
-        if delta > random_number:
-            winner = combatant_1
-            loser = combatant_2
-        else:
-            winner = combatant_2
-            loser = combatant_1
+            # Log the outcome
+            logger.info("Battle between %s and %s won by %s", combatant_1.meal, combatant_2.meal, winner.meal)
 
-        # Log the winner
-        logger.info("The winner is: %s", winner.meal)
+            # Update stats for both combatants in one transaction
+            apply_battle_result(winner.id, loser.id)
 
-        # Update stats for both combatants
-        update_meal_stats(winner.id, 'win')
-        update_meal_stats(loser.id, 'loss')
+            # Keep only the winner; there are exactly two combatants, so no need to search for the loser.
+            # Assign in place so a list handed out by get_combatants stays current, as with clear_combatants.
+            self.combatants[:] = (winner,)
 
-        # Remove the losing combatant from combatants
-        self.combatants.remove(loser)
-
-        return winner.meal
+            return winner.meal
 
     def clear_combatants(self):
         logger.info("Clearing the combatants list.")
-        self.combatants.clear()
+        with self._lock:
+            self.combatants.clear()
 
     def get_battle_score(self, combatant: Meal) -> float:
-        difficulty_modifier = {"HIGH": 1, "MED": 2, "LOW": 3}
-
-        # Log the calculation process
-        logger.info("Calculating battle score for %s: price=%.3f, cuisine=%s, difficulty=%s",
-                    combatant.meal, combatant.price, combatant.cuisine, combatant.difficulty)
-
         # Calculate score
-        score = (combatant.price * len(combatant.cuisine)) - difficulty_modifier[combatant.difficulty]
+        score = combatant.price * len(combatant.cuisine) - _DIFFICULTY_MODIFIER[combatant.difficulty]
 
-        # Log the calculated score
-        logger.info("Battle score for %s: %.3f", combatant.meal, score)
+        # Log the calculation; dropped unformatted below DEBUG
+        logger.debug("Battle score for %s: price=%.3f, cuisine=%s, difficulty=%s -> %.3f",
+                     combatant.meal, combatant.price, combatant.cuisine, combatant.difficulty, score)
 
         return score
 
     def get_combatants(self) -> List[Meal]:
-        logger.info("Retrieving current list of combatants.")
+        logger.debug("Retrieving current list of combatants.")
         return self.combatants
 
     def prep_combatant(self, combatant_data: Meal):
-        if len(self.combatants) >= 2:
-            logger.error("Attempted to add combatant '%s' but combatants list is full", combatant_data.meal)
-            raise ValueError("Combatant list is full, cannot add more combatants.")
+        with self._lock:
+            if len(self.combatants) >= 2:
+                logger.error("Attempted to add combatant '%s' but combatants list is full", combatant_data.meal)
+                raise ValueError("Combatant list is full, cannot add more combatants.")
 
-        # Log the addition of the combatant
-        logger.info("Adding combatant '%s' to combatants list", combatant_data.meal)
+            # Log the addition of the combatant
+            logger.info("Adding combatant '%s' to combatants list", combatant_data.meal)
 
-        self.combatants.append(combatant_data)
+            self.combatants.append(combatant_data)
 
-        # Log the current state of combatants
-        logger.info("Current combatants list: %s", [combatant.meal for combatant in self.combatants])
+            # Log the current state of combatants; the name list is only built when DEBUG is on
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Current combatants list: %s", [combatant.meal for combatant in self.combatants])
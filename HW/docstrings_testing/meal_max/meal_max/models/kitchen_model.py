@@ -1,8 +1,11 @@
+from collections import OrderedDict
 from dataclasses import dataclass
 import logging
 import os
 import sqlite3
-from typing import Any
+import threading
+import time
+from typing import Any, Optional, Tuple, Union
 
 from meal_max.utils.sql_utils import get_db_connection
 from meal_max.utils.logger import configure_logger
@@ -11,9 +14,38 @@ from meal_max.utils.logger import configure_logger
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
-
-@dataclass
+# statements run on every request, kept as constants so each pooled connection
+# prepares them once and reuses them from its statement cache
+_INSERT_MEAL_SQL = "INSERT INTO meals (meal, cuisine, price, difficulty) VALUES (?, ?, ?, ?)"
+_SELECT_MEAL_BY_ID_SQL = "SELECT id, meal, cuisine, price, difficulty, deleted FROM meals WHERE id = ?"
+_SELECT_MEAL_BY_NAME_SQL = "SELECT id, meal, cuisine, price, difficulty, deleted FROM meals WHERE meal = ?"
+_SELECT_DELETED_SQL = "SELECT deleted FROM meals WHERE id = ?"
+_DELETE_MEAL_SQL = "UPDATE meals SET deleted = TRUE WHERE id = ? AND deleted = FALSE"
+_RECORD_WIN_SQL = "UPDATE meals SET battles = battles + 1, wins = wins + 1 WHERE id = ? AND deleted = FALSE"
+_RECORD_LOSS_SQL = "UPDATE meals SET battles = battles + 1 WHERE id = ? AND deleted = FALSE"
+
+# the complete leaderboard query for each allowed sort order. SQLite computes the percentage;
+# the win_pct order uses the unrounded ratio so near-ties keep their order. Each order has a
+# partial index in create_meal_table.sql that matches this WHERE clause, so keep them in step
+_LEADERBOARD_SELECT_SQL = (
+    "SELECT id, meal, cuisine, price, difficulty, battles, wins, ROUND(wins * 100.0 / battles, 1) AS win_pct "
+    "FROM meals WHERE deleted = FALSE AND battles > 0"
+)
+_LEADERBOARD_SQL = {
+    "wins": _LEADERBOARD_SELECT_SQL + " ORDER BY wins DESC",
+    "win_pct": _LEADERBOARD_SELECT_SQL + " ORDER BY wins * 1.0 / battles DESC",
+}
+
+# accepted meal difficulty levels
+_DIFFICULTIES = frozenset(('LOW', 'MED', 'HIGH'))
+
+
+@dataclass(frozen=True)
 class Meal:
+    # Declared by hand because dataclass(slots=True) needs Python 3.10 and the image runs 3.9.
+    # Instances are frozen since cached meals are shared between callers.
+    __slots__ = ("id", "meal", "cuisine", "price", "difficulty")
+
     id: int
     meal: str
     cuisine: str
@@ -23,23 +55,73 @@ class Meal:
     def __post_init__(self):
         if self.price < 0:
             raise ValueError("Price must be a positive value.")
-        if self.difficulty not in ['LOW', 'MED', 'HIGH']:
+        if self.difficulty not in _DIFFICULTIES:
             raise ValueError("Difficulty must be 'LOW', 'MED', or 'HIGH'.")
 
 
+# in-process cache of computed leaderboards, keyed by sort order; each worker keeps its
+# own, so the TTL bounds how long another worker's battles can go unseen
+LEADERBOARD_CACHE_TTL = float(os.getenv("LEADERBOARD_CACHE_TTL", "30"))
+
+_leaderboard_cache: dict[str, tuple[float, list[dict[str, Any]]]] = {}
+_leaderboard_cache_lock = threading.Lock()
+_leaderboard_cache_version = 0
+
+
+def _invalidate_leaderboard_cache() -> None:
+    """Drop every cached leaderboard after a write that can change one."""
+    global _leaderboard_cache_version
+    with _leaderboard_cache_lock:
+        _leaderboard_cache_version += 1
+        _leaderboard_cache.clear()
+
+
+# in-process LRU of meals looked up by ID or by name, least recently used first. A Meal
+# holds no battle stats, so only deleting meals or clearing the table invalidates it.
+MEAL_CACHE_SIZE = int(os.getenv("MEAL_CACHE_SIZE", "1024"))
+
+_meal_cache: OrderedDict = OrderedDict()
+_meal_cache_lock = threading.Lock()
+_meal_cache_version = 0
+
+
+def _get_cached_meal(key: Union[int, str]) -> Tuple[Optional[Meal], int]:
+    """Look a meal up by ID or name, returning it (or None) with the cache version read."""
+    with _meal_cache_lock:
+        meal = _meal_cache.get(key)
+        if meal is not None:
+            _meal_cache.move_to_end(key)
+        return meal, _meal_cache_version
+
+def _cache_meal(meal: Meal, cache_version: int) -> None:
+    """Store a meal under its ID and name unless a write has invalidated the cache since cache_version was read."""
+    with _meal_cache_lock:
+        if cache_version != _meal_cache_version:
+            return
+        for key in (meal.id, meal.meal):
+            _meal_cache[key] = meal
+            _meal_cache.move_to_end(key)
+        while len(_meal_cache) > MEAL_CACHE_SIZE:
+            _meal_cache.popitem(last=False)
+
+def _invalidate_meal_cache() -> None:
+    """Drop every cached meal."""
+    global _meal_cache_version
+    with _meal_cache_lock:
+        _meal_cache_version += 1
+        _meal_cache.clear()
+
+
 def create_meal(meal: str, cuisine: str, price: float, difficulty: str) -> None:
     if not isinstance(price, (int, float)) or price <= 0:
         raise ValueError(f"Invalid price: {price}. Price must be a positive number.")
-    if difficulty not in ['LOW', 'MED', 'HIGH']:
+    if difficulty not in _DIFFICULTIES:
         raise ValueError(f"Invalid difficulty level: {difficulty}. Must be 'LOW', 'MED', or 'HIGH'.")
 
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO meals (meal, cuisine, price, difficulty)
-                VALUES (?, ?, ?, ?)
-            """, (meal, cuisine, price, difficulty))
+            cursor.execute(_INSERT_MEAL_SQL, (meal, cuisine, price, difficulty))
             conn.commit()
 
             logger.info("Meal successfully added to the database: %s", meal)
@@ -66,6 +148,8 @@ def clear_meals() -> None:
             cursor = conn.cursor()
             cursor.executescript(create_table_script)
             conn.commit()
+            _invalidate_leaderboard_cache()
+            _invalidate_meal_cache()
 
             logger.info("Meals cleared successfully.")
 
@@ -73,22 +157,34 @@ def clear_meals() -> None:
         logger.error("Database error while clearing meals: %s", str(e))
         raise e
 
+def _raise_unmatched_meal(cursor: sqlite3.Cursor, meal_id: int) -> None:
+    """
+    Raises the error for a meal that a guarded UPDATE did not match.
+
+    Only runs on the failure path, to tell a missing meal from a deleted one.
+
+    Raises:
+        ValueError: If the meal does not exist or has been deleted.
+    """
+    cursor.execute(_SELECT_DELETED_SQL, (meal_id,))
+    row = cursor.fetchone()
+    if row is None:
+        logger.info("Meal with ID %s not found", meal_id)
+        raise ValueError(f"Meal with ID {meal_id} not found")
+    logger.info("Meal with ID %s has been deleted", meal_id)
+    raise ValueError(f"Meal with ID {meal_id} has been deleted")
+
 def delete_meal(meal_id: int) -> None:
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT deleted FROM meals WHERE id = ?", (meal_id,))
-            try:
-                deleted = cursor.fetchone()[0]
-                if deleted:
-                    logger.info("Meal with ID %s has already been deleted", meal_id)
-                    raise ValueError(f"Meal with ID {meal_id} has been deleted")
-            except TypeError:
-                logger.info("Meal with ID %s not found", meal_id)
-                raise ValueError(f"Meal with ID {meal_id} not found")
-
-            cursor.execute("UPDATE meals SET deleted = TRUE WHERE id = ?", (meal_id,))
+            cursor.execute(_DELETE_MEAL_SQL, (meal_id,))
+            if cursor.rowcount == 0:
+                _raise_unmatched_meal(cursor, meal_id)
             conn.commit()
+            _invalidate_leaderboard_cache()
+            # Only the ID is known here, so the meal's name entry can't be singled out
+            _invalidate_meal_cache()
 
             logger.info("Meal with ID %s marked as deleted.", meal_id)
 
@@ -97,38 +193,34 @@ def delete_meal(meal_id: int) -> None:
         raise e
 
 def get_leaderboard(sort_by: str="wins") -> dict[str, Any]:
-    query = """
-        SELECT id, meal, cuisine, price, difficulty, battles, wins, (wins * 1.0 / battles) AS win_pct
-        FROM meals WHERE deleted = false AND battles > 0
-    """
-
-    if sort_by == "win_pct":
-        query += " ORDER BY win_pct DESC"
-    elif sort_by == "wins":
-        query += " ORDER BY wins DESC"
-    else:
+    query = _LEADERBOARD_SQL.get(sort_by)
+    if query is None:
         logger.error("Invalid sort_by parameter: %s", sort_by)
         raise ValueError("Invalid sort_by parameter: %s" % sort_by)
 
+    with _leaderboard_cache_lock:
+        cached = _leaderboard_cache.get(sort_by)
+        cache_version = _leaderboard_cache_version
+    if cached is not None and cached[0] > time.monotonic():
+        logger.debug("Leaderboard retrieved from cache")
+        # Hand out copies so callers can't modify the cached rows
+        return [dict(meal) for meal in cached[1]]
+
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
+            # Set on the cursor, not the pooled connection, so other callers still get tuples
+            cursor.row_factory = sqlite3.Row
             cursor.execute(query)
-            rows = cursor.fetchall()
-
-        leaderboard = []
-        for row in rows:
-            meal = {
-                'id': row[0],
-                'meal': row[1],
-                'cuisine': row[2],
-                'price': row[3],
-                'difficulty': row[4],
-                'battles': row[5],
-                'wins': row[6],
-                'win_pct': round(row[7] * 100, 1)  # Convert to percentage
-            }
-            leaderboard.append(meal)
+            leaderboard = [dict(row) for row in cursor.fetchall()]
+
+        with _leaderboard_cache_lock:
+            # Skip caching if a write invalidated the cache while the query ran
+            if cache_version == _leaderboard_cache_version:
+                _leaderboard_cache[sort_by] = (
+                    time.monotonic() + LEADERBOARD_CACHE_TTL,
+                    [dict(meal) for meal in leaderboard],
+                )
 
         logger.info("Leaderboard retrieved successfully")
         return leaderboard
@@ -138,17 +230,23 @@ def get_leaderboard(sort_by: str="wins") -> dict[str, Any]:
         raise e
 
 def get_meal_by_id(meal_id: int) -> Meal:
+    meal, cache_version = _get_cached_meal(meal_id)
+    if meal is not None:
+        return meal
+
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT id, meal, cuisine, price, difficulty, deleted FROM meals WHERE id = ?", (meal_id,))
+            cursor.execute(_SELECT_MEAL_BY_ID_SQL, (meal_id,))
             row = cursor.fetchone()
 
             if row:
                 if row[5]:
                     logger.info("Meal with ID %s has been deleted", meal_id)
                     raise ValueError(f"Meal with ID {meal_id} has been deleted")
-                return Meal(id=row[0], meal=row[1], cuisine=row[2], price=row[3], difficulty=row[4])
+                meal = Meal(id=row[0], meal=row[1], cuisine=row[2], price=row[3], difficulty=row[4])
+                _cache_meal(meal, cache_version)
+                return meal
             else:
                 logger.info("Meal with ID %s not found", meal_id)
                 raise ValueError(f"Meal with ID {meal_id} not found")
@@ -159,17 +257,23 @@ def get_meal_by_id(meal_id: int) -> Meal:
 
 
 def get_meal_by_name(meal_name: str) -> Meal:
+    meal, cache_version = _get_cached_meal(meal_name)
+    if meal is not None:
+        return meal
+
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT id, meal, cuisine, price, difficulty, deleted FROM meals WHERE meal = ?", (meal_name,))
+            cursor.execute(_SELECT_MEAL_BY_NAME_SQL, (meal_name,))
             row = cursor.fetchone()
 
             if row:
                 if row[5]:
                     logger.info("Meal with name %s has been deleted", meal_name)
                     raise ValueError(f"Meal with name {meal_name} has been deleted")
-                return Meal(id=row[0], meal=row[1], cuisine=row[2], price=row[3], difficulty=row[4])
+                meal = Meal(id=row[0], meal=row[1], cuisine=row[2], price=row[3], difficulty=row[4])
+                _cache_meal(meal, cache_version)
+                return meal
             else:
                 logger.info("Meal with name %s not found", meal_name)
                 raise ValueError(f"Meal with name {meal_name} not found")
@@ -180,27 +284,51 @@ def get_meal_by_name(meal_name: str) -> Meal:
 
 
 def update_meal_stats(meal_id: int, result: str) -> None:
+    if result == 'win':
+        query = _RECORD_WIN_SQL
+    elif result == 'loss':
+        query = _RECORD_LOSS_SQL
+    else:
+        raise ValueError(f"Invalid result: {result}. Expected 'win' or 'loss'.")
+
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT deleted FROM meals WHERE id = ?", (meal_id,))
-            try:
-                deleted = cursor.fetchone()[0]
-                if deleted:
-                    logger.info("Meal with ID %s has been deleted", meal_id)
-                    raise ValueError(f"Meal with ID {meal_id} has been deleted")
-            except TypeError:
-                logger.info("Meal with ID %s not found", meal_id)
-                raise ValueError(f"Meal with ID {meal_id} not found")
+            cursor.execute(query, (meal_id,))
+            if cursor.rowcount == 0:
+                _raise_unmatched_meal(cursor, meal_id)
+            conn.commit()
+            _invalidate_leaderboard_cache()
 
-            if result == 'win':
-                cursor.execute("UPDATE meals SET battles = battles + 1, wins = wins + 1 WHERE id = ?", (meal_id,))
-            elif result == 'loss':
-                cursor.execute("UPDATE meals SET battles = battles + 1 WHERE id = ?", (meal_id,))
-            else:
-                raise ValueError(f"Invalid result: {result}. Expected 'win' or 'loss'.")
+    except sqlite3.Error as e:
+        logger.error("Database error: %s", str(e))
+        raise e
+
+def apply_battle_result(winner_id: int, loser_id: int) -> None:
+    """
+    Records a battle's outcome for both meals in a single transaction.
+
+    Equivalent to update_meal_stats(winner_id, 'win') followed by
+    update_meal_stats(loser_id, 'loss'), but with one connection and one
+    commit, so a battle costs one fsync and either both stats change or neither does.
+
+    Args:
+        winner_id (int): The ID of the winning meal.
+        loser_id (int): The ID of the losing meal.
 
+    Raises:
+        ValueError: If either meal does not exist or has been deleted.
+        sqlite3.Error: If any database error occurs.
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            for query, meal_id in ((_RECORD_WIN_SQL, winner_id), (_RECORD_LOSS_SQL, loser_id)):
+                cursor.execute(query, (meal_id,))
+                if cursor.rowcount == 0:
+                    _raise_unmatched_meal(cursor, meal_id)
             conn.commit()
+            _invalidate_leaderboard_cache()
 
     except sqlite3.Error as e:
         logger.error("Database error: %s", str(e))
@@ -1,11 +1,13 @@
 import logging
+import os
 import sys
 
 from flask import current_app, has_request_context
 
 
 def configure_logger(logger):
-    logger.setLevel(logging.DEBUG)  # Set the desired logging level here
+    # Set the desired logging level in the environment; DEBUG records are skipped unformatted below it
+    logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
 
     # Create a console handler that logs to stderr
     handler = logging.StreamHandler(sys.stderr)
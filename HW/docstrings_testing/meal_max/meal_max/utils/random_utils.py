@@ -1,4 +1,10 @@
+from collections import deque
 import logging
+import os
+import secrets
+import threading
+from typing import List
+
 import requests
 
 from meal_max.utils.logger import configure_logger
@@ -6,28 +12,54 @@ from meal_max.utils.logger import configure_logger
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
+# Where battle randomness comes from: "local" draws from the OS CSPRNG with no network
+# round trip; "random.org" keeps the external source but fetches numbers in batches
+RANDOM_SOURCE = os.getenv("RANDOM_SOURCE", "local")
 
-def get_random() -> float:
-    url = "https://www.random.org/decimal-fractions/?num=1&dec=2&col=1&format=plain&rnd=new"
+# How many numbers to fetch from random.org at once, and how low the buffer may run
+# before a background refill starts
+RANDOM_ORG_BATCH_SIZE = int(os.getenv("RANDOM_ORG_BATCH_SIZE", "100"))
+RANDOM_ORG_LOW_WATER = max(1, RANDOM_ORG_BATCH_SIZE // 4)
+
+_system_random = secrets.SystemRandom()
+
+# Keep-alive session shared by every battle, so a request to random.org reuses an open
+# TLS connection instead of doing a fresh DNS lookup and handshake each time. That
+# shortens how long each battle holds its worker thread waiting on the network.
+_session = requests.Session()
+
+# Prefetched random.org numbers; only one refill runs at a time, and _refill_pending
+# (guarded by _refill_state_lock) keeps more than one background refill from being started
+_buffer: deque = deque()
+_refill_lock = threading.Lock()
+_refill_state_lock = threading.Lock()
+_refill_pending = False
+
+
+def _fetch_batch() -> List[float]:
+    url = f"https://www.random.org/decimal-fractions/?num={RANDOM_ORG_BATCH_SIZE}&dec=2&col=1&format=plain&rnd=new"
 
     try:
         # Log the request to random.org
-        logger.info("Fetching random number from %s", url)
+        logger.info("Fetching random numbers from %s", url)
 
-        response = requests.get(url, timeout=5)
+        response = _session.get(url, timeout=5)
 
         # Check if the request was successful
         response.raise_for_status()
 
-        random_number_str = response.text.strip()
+        random_number_strs = response.text.split()
 
         try:
-            random_number = float(random_number_str)
+            random_numbers = [float(random_number_str) for random_number_str in random_number_strs]
         except ValueError:
-            raise ValueError("Invalid response from random.org: %s" % random_number_str)
+            raise ValueError("Invalid response from random.org: %s" % response.text.strip())
 
-        logger.info("Received random number: %.3f", random_number)
-        return random_number
+        if not random_numbers:
+            raise ValueError("Empty response from random.org")
+
+        logger.info("Received %d random numbers", len(random_numbers))
+        return random_numbers
 
     except requests.exceptions.Timeout:
         logger.error("Request to random.org timed out.")
@@ -36,3 +68,43 @@ def get_random() -> float:
     except requests.exceptions.RequestException as e:
         logger.error("Request to random.org failed: %s", e)
         raise RuntimeError("Request to random.org failed: %s" % e)
+
+def _refill_in_background() -> None:
+    global _refill_pending
+    # A failure here is only logged; the next battle to find the buffer empty retries and raises
+    try:
+        with _refill_lock:
+            _buffer.extend(_fetch_batch())
+    except (RuntimeError, ValueError) as e:
+        logger.error("Background refill from random.org failed: %s", e)
+    finally:
+        with _refill_state_lock:
+            _refill_pending = False
+
+def _start_refill() -> None:
+    global _refill_pending
+    with _refill_state_lock:
+        if _refill_pending:
+            return
+        _refill_pending = True
+    threading.Thread(target=_refill_in_background, daemon=True).start()
+
+def get_random() -> float:
+    if RANDOM_SOURCE != "random.org":
+        return _system_random.random()
+
+    while True:
+        try:
+            random_number = _buffer.popleft()
+            break
+        except IndexError:
+            # The buffer ran dry, so this battle waits for a batch (or the refill already under way)
+            with _refill_lock:
+                if not _buffer:
+                    _buffer.extend(_fetch_batch())
+
+    if len(_buffer) < RANDOM_ORG_LOW_WATER:
+        _start_refill()
+
+    logger.info("Using random number: %.3f", random_number)
+    return random_number
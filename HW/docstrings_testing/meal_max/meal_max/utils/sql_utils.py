@@ -1,7 +1,9 @@
 from contextlib import contextmanager
 import logging
 import os
+import queue
 import sqlite3
+import threading
 
 from meal_max.utils.logger import configure_logger
 
@@ -13,14 +15,102 @@ configure_logger(logger)
 # load the db path from the environment with a default value
 DB_PATH = os.getenv("DB_PATH", "/app/sql/meal_max.db")
 
+# maximum number of connections kept open by the pool
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
 
-def check_database_connection():
+# how often (in seconds) a thread waiting on a full pool checks whether a slot was freed
+POOL_RECHECK_INTERVAL = 0.1
+
+_pool: queue.LifoQueue = queue.LifoQueue(maxsize=POOL_SIZE)
+_pool_lock = threading.Lock()
+_pool_created = 0
+
+# applied once to every connection the pool opens
+CONNECTION_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA cache_size=-20000;
+    PRAGMA busy_timeout=30000;
+"""
+
+
+def _make_conn() -> sqlite3.Connection:
+    """Open a new SQLite connection that can be handed to any thread by the pool.
+
+    The connection runs in WAL mode with relaxed fsyncs, so readers do not block
+    behind a writer and commits do not wait on a full sync. Writers still take
+    turns: a writer that finds the database locked waits for up to busy_timeout
+    instead of failing.
+    """
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    conn.executescript(CONNECTION_PRAGMAS)
+    return conn
+
+def _acquire_conn() -> sqlite3.Connection:
+    """Take a connection from the pool, opening a new one while under POOL_SIZE.
+
+    Blocks until a connection is returned if the pool is exhausted, re-checking
+    every POOL_RECHECK_INTERVAL seconds in case a discarded connection freed a slot.
+    """
+    global _pool_created
+    while True:
+        try:
+            return _pool.get_nowait()
+        except queue.Empty:
+            pass
+
+        with _pool_lock:
+            if _pool_created < POOL_SIZE:
+                conn = _make_conn()
+                _pool_created += 1
+                return conn
+
+        try:
+            return _pool.get(timeout=POOL_RECHECK_INTERVAL)
+        except queue.Empty:
+            continue
+
+def _release_conn(conn: sqlite3.Connection) -> None:
+    """Discard any uncommitted work and hand the connection back to the pool.
+
+    A connection that cannot even be rolled back is discarded instead.
+    """
+    try:
+        conn.rollback()
+    except sqlite3.Error as e:
+        logger.error("Rollback failed, discarding connection: %s", str(e))
+        _discard_conn(conn)
+        return
+    _pool.put(conn)
+
+def _discard_conn(conn: sqlite3.Connection) -> None:
+    """Close a connection that hit a database error and put a fresh one in its place.
+
+    The replacement goes straight into the pool, so a thread already waiting for a
+    connection is woken. If it cannot be opened, the slot is freed instead and a
+    waiting thread opens one itself on its next re-check.
+    """
+    global _pool_created
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        # This ensures the connection is actually active
-        cursor.execute("SELECT 1;")
         conn.close()
+    except sqlite3.Error:
+        pass
+    try:
+        replacement = _make_conn()
+    except sqlite3.Error as e:
+        logger.error("Could not replace discarded connection: %s", str(e))
+        with _pool_lock:
+            _pool_created -= 1
+        return
+    _pool.put(replacement)
+
+
+def check_database_connection():
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            # This ensures the connection is actually active
+            cursor.execute("SELECT 1;")
     except sqlite3.Error as e:
         error_message = f"Database connection error: {e}"
         logger.error(error_message)
@@ -28,10 +118,9 @@ def check_database_connection():
 
 def check_table_exists(tablename: str):
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(f"SELECT 1 FROM {tablename} LIMIT 1;")
-        conn.close()
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT 1 FROM {tablename} LIMIT 1;")
     except sqlite3.Error as e:
         error_message = f"Table check error: {e}"
         logger.error(error_message)
@@ -45,14 +134,32 @@ def check_table_exists(tablename: str):
 ###################################################
 @contextmanager
 def get_db_connection():
+    """
+    Context manager for SQLite database connection.
+
+    Connections are borrowed from a pool of at most POOL_SIZE connections and
+    returned to it on exit, so the connection and its page cache are reused
+    across calls. A connection that raised a database error other than a
+    constraint violation is closed instead of being returned, and the pool
+    opens a fresh one in its place.
+
+    Yields:
+        sqlite3.Connection: The SQLite connection object.
+    """
     conn = None
+    failed = False
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = _acquire_conn()
         yield conn
     except sqlite3.Error as e:
+        # A constraint violation leaves the connection usable; anything else may not
+        failed = not isinstance(e, sqlite3.IntegrityError)
         logger.error("Database connection error: %s", str(e))
         raise e
     finally:
         if conn:
-            conn.close()
-            logger.info("Database connection closed.")
+            if failed:
+                _discard_conn(conn)
+                logger.info("Database connection replaced after an error.")
+            else:
+                _release_conn(conn)
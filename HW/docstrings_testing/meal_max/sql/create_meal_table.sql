@@ -8,4 +8,13 @@ CREATE TABLE meals (
     battles INTEGER DEFAULT 0,
     wins INTEGER DEFAULT 0,
     deleted BOOLEAN DEFAULT FALSE
-);
\ No newline at end of file
+);
+
+-- meal is UNIQUE, so lookups by name already use SQLite's automatic index.
+-- The leaderboard only ranks live meals that have fought, so these partial indexes
+-- hold just those rows, already in each sort order. Their WHERE clause must match
+-- the one in kitchen_model's leaderboard query.
+CREATE INDEX IF NOT EXISTS idx_meals_leaderboard_wins ON meals (wins)
+    WHERE deleted = FALSE AND battles > 0;
+CREATE INDEX IF NOT EXISTS idx_meals_leaderboard_win_pct ON meals (wins * 1.0 / battles)
+    WHERE deleted = FALSE AND battles > 0;
@@ -1,6 +1,6 @@
 import logging
 from typing import List
-from music_collection.models.song_model import Song, update_play_count
+from music_collection.models.song_model import Song, update_play_count, update_play_counts
 from music_collection.utils.logger import configure_logger
 
 logger = logging.getLogger(__name__)
@@ -45,7 +45,7 @@ class PlaylistModel:
             raise TypeError("Song is not a valid song")
 
         song_id = self.validate_song_id(song.id, check_in_playlist=False)
-        if song_id in [song_in_playlist.id for song_in_playlist in self.playlist]:
+        if any(song_in_playlist.id == song_id for song_in_playlist in self.playlist):
             logger.error("Song with ID %d already exists in the playlist", song.id)
             raise ValueError(f"Song with ID {song.id} already exists in the playlist")
 
@@ -63,8 +63,8 @@ class PlaylistModel:
         """
         logger.info("Removing song with id %d from playlist", song_id)
         self.check_if_empty()
-        song_id = self.validate_song_id(song_id)
-        self.playlist = [song_in_playlist for song_in_playlist in self.playlist if song_in_playlist.id != song_id]
+        song_id = self.validate_song_id(song_id, check_in_playlist=False)
+        del self.playlist[self._get_song_index(song_id)]
         logger.info("Song with id %d has been removed", song_id)
 
     def remove_song_by_track_number(self, track_number: int) -> None:
@@ -89,8 +89,9 @@ class PlaylistModel:
         Clears all songs from the playlist. If the playlist is already empty, logs a warning.
         """
         logger.info("Clearing playlist")
-        if self.get_playlist_length() == 0:
+        if not self.playlist:
             logger.warning("Clearing an empty playlist")
+            return
         self.playlist.clear()
 
     ##################################################
@@ -116,9 +117,9 @@ class PlaylistModel:
             ValueError: If the playlist is empty or the song is not found.
         """
         self.check_if_empty()
-        song_id = self.validate_song_id(song_id)
-        logger.info("Getting song with id %d from playlist", song_id)
-        return next((song for song in self.playlist if song.id == song_id), None)
+        song_id = self.validate_song_id(song_id, check_in_playlist=False)
+        logger.debug("Getting song with id %d from playlist", song_id)
+        return self.playlist[self._get_song_index(song_id)]
 
     def get_song_by_track_number(self, track_number: int) -> Song:
         """
@@ -133,14 +134,13 @@ class PlaylistModel:
         self.check_if_empty()
         track_number = self.validate_track_number(track_number)
         playlist_index = track_number - 1
-        logger.info("Getting song at track number %d from playlist", track_number)
+        logger.debug("Getting song at track number %d from playlist", track_number)
         return self.playlist[playlist_index]
 
     def get_current_song(self) -> Song:
         """
         Returns the current song being played.
         """
-        self.check_if_empty()
         return self.get_song_by_track_number(self.current_track_number)
 
     def get_playlist_length(self) -> int:
@@ -180,9 +180,8 @@ class PlaylistModel:
         """
         logger.info("Moving song with ID %d to the beginning of the playlist", song_id)
         self.check_if_empty()
-        song_id = self.validate_song_id(song_id)
-        song = self.get_song_by_song_id(song_id)
-        self.playlist.remove(song)
+        song_id = self.validate_song_id(song_id, check_in_playlist=False)
+        song = self.playlist.pop(self._get_song_index(song_id))
         self.playlist.insert(0, song)
         logger.info("Song with ID %d has been moved to the beginning", song_id)
 
@@ -195,9 +194,8 @@ class PlaylistModel:
         """
         logger.info("Moving song with ID %d to the end of the playlist", song_id)
         self.check_if_empty()
-        song_id = self.validate_song_id(song_id)
-        song = self.get_song_by_song_id(song_id)
-        self.playlist.remove(song)
+        song_id = self.validate_song_id(song_id, check_in_playlist=False)
+        song = self.playlist.pop(self._get_song_index(song_id))
         self.playlist.append(song)
         logger.info("Song with ID %d has been moved to the end", song_id)
 
@@ -211,11 +209,11 @@ class PlaylistModel:
         """
         logger.info("Moving song with ID %d to track number %d", song_id, track_number)
         self.check_if_empty()
-        song_id = self.validate_song_id(song_id)
+        song_id = self.validate_song_id(song_id, check_in_playlist=False)
+        song_index = self._get_song_index(song_id)
         track_number = self.validate_track_number(track_number)
         playlist_index = track_number - 1
-        song = self.get_song_by_song_id(song_id)
-        self.playlist.remove(song)
+        song = self.playlist.pop(song_index)
         self.playlist.insert(playlist_index, song)
         logger.info("Song with ID %d has been moved to track number %d", song_id, track_number)
 
@@ -232,17 +230,15 @@ class PlaylistModel:
         """
         logger.info("Swapping songs with IDs %d and %d", song1_id, song2_id)
         self.check_if_empty()
-        song1_id = self.validate_song_id(song1_id)
-        song2_id = self.validate_song_id(song2_id)
+        song1_id = self.validate_song_id(song1_id, check_in_playlist=False)
+        song2_id = self.validate_song_id(song2_id, check_in_playlist=False)
+        index1 = self._get_song_index(song1_id)
+        index2 = self._get_song_index(song2_id)
 
         if song1_id == song2_id:
             logger.error("Cannot swap a song with itself, both song IDs are the same: %d", song1_id)
             raise ValueError(f"Cannot swap a song with itself, both song IDs are the same: {song1_id}")
 
-        song1 = self.get_song_by_song_id(song1_id)
-        song2 = self.get_song_by_song_id(song2_id)
-        index1 = self.playlist.index(song1)
-        index2 = self.playlist.index(song2)
         self.playlist[index1], self.playlist[index2] = self.playlist[index2], self.playlist[index1]
         logger.info("Swapped songs with IDs %d and %d", song1_id, song2_id)
 
@@ -262,10 +258,10 @@ class PlaylistModel:
         current_song = self.get_song_by_track_number(self.current_track_number)
         logger.info("Playing song: %s (ID: %d) at track number: %d", current_song.title, current_song.id, self.current_track_number)
         update_play_count(current_song.id)
-        logger.info("Updated play count for song: %s (ID: %d)", current_song.title, current_song.id)
+        logger.debug("Updated play count for song: %s (ID: %d)", current_song.title, current_song.id)
         previous_track_number = self.current_track_number
-        self.current_track_number = (self.current_track_number % self.get_playlist_length()) + 1
-        logger.info("Track number updated from %d to %d", previous_track_number, self.current_track_number)
+        self.current_track_number = (self.current_track_number % len(self.playlist)) + 1
+        logger.debug("Track number updated from %d to %d", previous_track_number, self.current_track_number)
 
     def play_entire_playlist(self) -> None:
         """
@@ -273,15 +269,15 @@ class PlaylistModel:
 
         Side-effects:
             Resets the current track number to 1.
-            Updates the play count for each song.
+            Updates the play count for each song in a single transaction.
         """
         self.check_if_empty()
         logger.info("Starting to play the entire playlist.")
+        update_play_counts([song.id for song in self.playlist])
+        if logger.isEnabledFor(logging.DEBUG):
+            for track_number, song in enumerate(self.playlist, start=1):
+                logger.debug("Played song: %s (ID: %d) at track number: %d", song.title, song.id, track_number)
         self.current_track_number = 1
-        logger.info("Reset current track number to 1.")
-        for _ in range(self.get_playlist_length()):
-            logger.info("Playing track number: %d", self.current_track_number)
-            self.play_current_song()
         logger.info("Finished playing the entire playlist. Current track number reset to 1.")
 
     def play_rest_of_playlist(self) -> None:
@@ -290,13 +286,16 @@ class PlaylistModel:
 
         Side-effects:
             Updates the current track number back to 1.
-            Updates the play count for each song in the rest of the playlist.
+            Updates the play count for each song in the rest of the playlist in a single transaction.
         """
         self.check_if_empty()
         logger.info("Starting to play the rest of the playlist from track number: %d", self.current_track_number)
-        for _ in range(self.get_playlist_length() - self.current_track_number + 1):
-            logger.info("Playing track number: %d", self.current_track_number)
-            self.play_current_song()
+        rest_of_playlist = self.playlist[self.current_track_number - 1:]
+        update_play_counts([song.id for song in rest_of_playlist])
+        if logger.isEnabledFor(logging.DEBUG):
+            for track_number, song in enumerate(rest_of_playlist, start=self.current_track_number):
+                logger.debug("Played song: %s (ID: %d) at track number: %d", song.title, song.id, track_number)
+        self.current_track_number = 1
         logger.info("Finished playing the rest of the playlist. Current track number reset to 1.")
 
     def rewind_playlist(self) -> None:
@@ -333,12 +332,29 @@ class PlaylistModel:
             raise ValueError(f"Invalid song id: {song_id}")
 
         if check_in_playlist:
-            if song_id not in [song_in_playlist.id for song_in_playlist in self.playlist]:
-                logger.error("Song with id %d not found in playlist", song_id)
-                raise ValueError(f"Song with id {song_id} not found in playlist")
+            self._get_song_index(song_id)
 
         return song_id
 
+    def _get_song_index(self, song_id: int) -> int:
+        """
+        Finds the position of a song in the playlist in a single pass.
+
+        Args:
+            song_id (int): The (already validated) ID of the song to find.
+
+        Returns:
+            int: The 0-based index of the song in the playlist.
+
+        Raises:
+            ValueError: If the song is not in the playlist.
+        """
+        for index, song_in_playlist in enumerate(self.playlist):
+            if song_in_playlist.id == song_id:
+                return index
+        logger.error("Song with id %d not found in playlist", song_id)
+        raise ValueError(f"Song with id {song_id} not found in playlist")
+
     def validate_track_number(self, track_number: int) -> int:
         """
         Validates the given track number, ensuring it is a non-negative integer within the playlist's range.
@@ -351,7 +367,7 @@ class PlaylistModel:
         """
         try:
             track_number = int(track_number)
-            if track_number < 1 or track_number > self.get_playlist_length():
+            if track_number < 1 or track_number > len(self.playlist):
                 logger.error("Invalid track number %d", track_number)
                 raise ValueError(f"Invalid track number: {track_number}")
         except ValueError:
@@ -1,7 +1,10 @@
+from collections import OrderedDict
 from dataclasses import dataclass
 import logging
 import os
 import sqlite3
+import threading
+from typing import Optional
 
 from music_collection.utils.logger import configure_logger
 from music_collection.utils.random_utils import get_random
@@ -11,6 +14,19 @@ from music_collection.utils.sql_utils import get_db_connection
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
+# the hottest write in the app; kept as a single constant so each pooled
+# connection prepares it once and reuses it from its statement cache
+_UPDATE_PLAY_COUNT_SQL = "UPDATE songs SET play_count = play_count + 1 WHERE id = ? AND deleted = FALSE"
+
+# get_random_song may run this twice, if the index it picked was deleted meanwhile
+_SELECT_SONG_AT_OFFSET_SQL = """
+    SELECT id, artist, title, year, genre, duration
+    FROM songs
+    WHERE deleted = FALSE
+    ORDER BY id
+    LIMIT 1 OFFSET ?
+"""
+
 
 @dataclass
 class Song:
@@ -28,6 +44,35 @@ class Song:
             raise ValueError(f"Year must be greater than 1900, got {self.year}")
 
 
+# in-process LRU of songs looked up by ID, least recently used first
+SONG_CACHE_SIZE = int(os.getenv("SONG_CACHE_SIZE", "1024"))
+
+_song_cache: OrderedDict = OrderedDict()
+_song_cache_lock = threading.Lock()
+_song_cache_version = 0
+
+
+def _cache_song(song: Song, cache_version: int) -> None:
+    """Store a song in the cache unless a write has invalidated the cache since cache_version was read."""
+    with _song_cache_lock:
+        if cache_version != _song_cache_version:
+            return
+        _song_cache[song.id] = song
+        _song_cache.move_to_end(song.id)
+        if len(_song_cache) > SONG_CACHE_SIZE:
+            _song_cache.popitem(last=False)
+
+def _invalidate_song_cache(song_id: Optional[int] = None) -> None:
+    """Drop a song from the cache, or every song if no ID is given."""
+    global _song_cache_version
+    with _song_cache_lock:
+        _song_cache_version += 1
+        if song_id is None:
+            _song_cache.clear()
+        else:
+            _song_cache.pop(song_id, None)
+
+
 def create_song(artist: str, title: str, year: int, genre: str, duration: int) -> None:
     """
     Creates a new song in the songs table.
@@ -83,6 +128,7 @@ def clear_catalog() -> None:
             cursor = conn.cursor()
             cursor.executescript(create_table_script)
             conn.commit()
+            _invalidate_song_cache()
 
             logger.info("Catalog cleared successfully.")
 
@@ -119,6 +165,7 @@ def delete_song(song_id: int) -> None:
             # Perform the soft delete by setting 'deleted' to TRUE
             cursor.execute("UPDATE songs SET deleted = TRUE WHERE id = ?", (song_id,))
             conn.commit()
+            _invalidate_song_cache(song_id)
 
             logger.info("Song with ID %s marked as deleted.", song_id)
 
@@ -130,6 +177,9 @@ def get_song_by_id(song_id: int) -> Song:
     """
     Retrieves a song from the catalog by its song ID.
 
+    Songs are served from an in-process cache when possible; deleting a song
+    or clearing the catalog invalidates the cached entries.
+
     Args:
         song_id (int): The ID of the song to retrieve.
 
@@ -139,10 +189,19 @@ def get_song_by_id(song_id: int) -> Song:
     Raises:
         ValueError: If the song is not found or is marked as deleted.
     """
+    with _song_cache_lock:
+        song = _song_cache.get(song_id)
+        if song is not None:
+            _song_cache.move_to_end(song_id)
+        cache_version = _song_cache_version
+    if song is not None:
+        logger.debug("Song with ID %s found in cache", song_id)
+        return song
+
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            logger.info("Attempting to retrieve song with ID %s", song_id)
+            logger.debug("Attempting to retrieve song with ID %s", song_id)
             cursor.execute("""
                 SELECT id, artist, title, year, genre, duration, deleted
                 FROM songs
@@ -154,8 +213,10 @@ def get_song_by_id(song_id: int) -> Song:
                 if row[6]:  # deleted flag
                     logger.info("Song with ID %s has been deleted", song_id)
                     raise ValueError(f"Song with ID {song_id} has been deleted")
-                logger.info("Song with ID %s found", song_id)
-                return Song(id=row[0], artist=row[1], title=row[2], year=row[3], genre=row[4], duration=row[5])
+                logger.debug("Song with ID %s found", song_id)
+                song = Song(id=row[0], artist=row[1], title=row[2], year=row[3], genre=row[4], duration=row[5])
+                _cache_song(song, cache_version)
+                return song
             else:
                 logger.info("Song with ID %s not found", song_id)
                 raise ValueError(f"Song with ID {song_id} not found")
@@ -261,6 +322,10 @@ def get_random_song() -> Song:
     """
     Retrieves a random song from the catalog.
 
+    Only the number of songs and the selected row are read from the database;
+    the catalog is never loaded in full. If songs are deleted between counting
+    them and reading the selected row, the index wraps onto the remaining songs.
+
     Returns:
         Song: A randomly selected Song object.
 
@@ -268,26 +333,37 @@ def get_random_song() -> Song:
         ValueError: If the catalog is empty.
     """
     try:
-        all_songs = get_all_songs()
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM songs WHERE deleted = FALSE")
+            num_songs = cursor.fetchone()[0]
 
-        if not all_songs:
+        if not num_songs:
             logger.info("Cannot retrieve random song because the song catalog is empty.")
             raise ValueError("The song catalog is empty.")
 
         # Get a random index using the random.org API
-        random_index = get_random(len(all_songs))
-        logger.info("Random index selected: %d (total songs: %d)", random_index, len(all_songs))
-
-        # Return the song at the random index, adjust for 0-based indexing
-        song_data = all_songs[random_index - 1]
-        return Song(
-            id=song_data["id"],
-            artist=song_data["artist"],
-            title=song_data["title"],
-            year=song_data["year"],
-            genre=song_data["genre"],
-            duration=song_data["duration"]
-        )
+        random_index = get_random(num_songs)
+        logger.info("Random index selected: %d (total songs: %d)", random_index, num_songs)
+
+        # Fetch only the song at the random index, adjust for 0-based indexing
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_SELECT_SONG_AT_OFFSET_SQL, (random_index - 1,))
+            row = cursor.fetchone()
+
+            while row is None:
+                # Songs were deleted since they were counted; wrap the index onto what is left
+                cursor.execute("SELECT COUNT(*) FROM songs WHERE deleted = FALSE")
+                num_songs = cursor.fetchone()[0]
+                if not num_songs:
+                    logger.info("Cannot retrieve random song because the song catalog is empty.")
+                    raise ValueError("The song catalog is empty.")
+                logger.info("Random index %d is past the %d remaining songs; wrapping it", random_index, num_songs)
+                cursor.execute(_SELECT_SONG_AT_OFFSET_SQL, ((random_index - 1) % num_songs,))
+                row = cursor.fetchone()
+
+        return Song(id=row[0], artist=row[1], title=row[2], year=row[3], genre=row[4], duration=row[5])
 
     except Exception as e:
         logger.error("Error while retrieving random song: %s", str(e))
@@ -307,25 +383,72 @@ def update_play_count(song_id: int) -> None:
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            logger.info("Attempting to update play count for song with ID %d", song_id)
+            logger.debug("Attempting to update play count for song with ID %d", song_id)
+
+            # Increment the play count, skipping deleted songs
+            cursor.execute(_UPDATE_PLAY_COUNT_SQL, (song_id,))
+            if cursor.rowcount == 0:
+                # Nothing was updated, so find out whether the song is missing or deleted
+                cursor.execute("SELECT deleted FROM songs WHERE id = ?", (song_id,))
+                if cursor.fetchone() is None:
+                    logger.info("Song with ID %d not found", song_id)
+                    raise ValueError(f"Song with ID {song_id} not found")
+                logger.info("Song with ID %d has been deleted", song_id)
+                raise ValueError(f"Song with ID {song_id} has been deleted")
+            conn.commit()
 
-            # Check if the song exists and if it's deleted
-            cursor.execute("SELECT deleted FROM songs WHERE id = ?", (song_id,))
-            try:
-                deleted = cursor.fetchone()[0]
-                if deleted:
-                    logger.info("Song with ID %d has been deleted", song_id)
-                    raise ValueError(f"Song with ID {song_id} has been deleted")
-            except TypeError:
-                logger.info("Song with ID %d not found", song_id)
-                raise ValueError(f"Song with ID {song_id} not found")
+            logger.debug("Play count incremented for song with ID: %d", song_id)
+
+    except sqlite3.Error as e:
+        logger.error("Database error while updating play count for song with ID %d: %s", song_id, str(e))
+        raise e
+
+def update_play_counts(song_ids: list[int]) -> None:
+    """
+    Increments the play count of several songs by song ID in a single transaction.
+
+    Args:
+        song_ids (list[int]): The IDs of the songs whose play counts should be incremented.
 
-            # Increment the play count
-            cursor.execute("UPDATE songs SET play_count = play_count + 1 WHERE id = ?", (song_id,))
+    Raises:
+        ValueError: If any of the songs does not exist or is marked as deleted, or if
+            one is deleted or restored while the batch is being applied.
+        sqlite3.Error: If there is a database error.
+    """
+    if not song_ids:
+        return
+
+    placeholders = ", ".join("?" for _ in song_ids)
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            logger.debug("Attempting to update play count for %d songs", len(song_ids))
+
+            # Increment every play count with one statement and one commit, skipping deleted songs
+            cursor.execute(f"""
+                UPDATE songs SET play_count = play_count + 1
+                WHERE id IN ({placeholders}) AND deleted = FALSE
+            """, tuple(song_ids))
+            if cursor.rowcount != len(set(song_ids)):
+                # Some songs were not updated, so undo the batch and report the first offender
+                conn.rollback()
+                cursor.execute(f"SELECT id, deleted FROM songs WHERE id IN ({placeholders})", tuple(song_ids))
+                deleted_by_id = dict(cursor.fetchall())
+                for song_id in song_ids:
+                    if song_id not in deleted_by_id:
+                        logger.info("Song with ID %d not found", song_id)
+                        raise ValueError(f"Song with ID {song_id} not found")
+                    if deleted_by_id[song_id]:
+                        logger.info("Song with ID %d has been deleted", song_id)
+                        raise ValueError(f"Song with ID {song_id} has been deleted")
+                # Every song looks playable now, so one changed between the two statements;
+                # the batch was rolled back either way, so report it rather than commit nothing
+                logger.info("Songs %s changed while their play counts were being updated", song_ids)
+                raise ValueError("Songs changed while their play counts were being updated; no play counts were incremented")
             conn.commit()
 
-            logger.info("Play count incremented for song with ID: %d", song_id)
+            logger.debug("Play count incremented for %d songs", len(song_ids))
 
     except sqlite3.Error as e:
-        logger.error("Database error while updating play count for song with ID %d: %s", song_id, str(e))
+        logger.error("Database error while updating play counts for songs %s: %s", song_ids, str(e))
         raise e
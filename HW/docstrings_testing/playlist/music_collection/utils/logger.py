@@ -1,26 +1,34 @@
 import logging
+import os
 import sys
 
 from flask import current_app, has_request_context
 
 
-def configure_logger(logger):
-    logger.setLevel(logging.DEBUG)  # Set the desired logging level here
+# Create a formatter with a timestamp, shared by every configured logger
+FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
 
-    # Create a console handler that logs to stderr
-    handler = logging.StreamHandler(sys.stderr)
-    handler.setLevel(logging.DEBUG)
+def configure_logger(logger):
+    # Set the desired logging level in the environment; DEBUG records are skipped unformatted below it
+    logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
 
-    # Create a formatter with a timestamp
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    # Only attach the console handler once, however many times the logger is configured
+    if not getattr(logger, "_configured", False):
+        # Create a console handler that logs to stderr
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setLevel(logging.DEBUG)
 
-    # Add the formatter to the handler
-    handler.setFormatter(formatter)
+        # Add the shared formatter to the handler
+        handler.setFormatter(FORMATTER)
 
-    # Add the handler to the logger
-    logger.addHandler(handler)
+        # Add the handler to the logger
+        logger.addHandler(handler)
+        logger._configured = True
 
     if has_request_context():
         app_logger = current_app.logger
         for handler in app_logger.handlers:
-            logger.addHandler(handler)
\ No newline at end of file
+            # Skip handlers that were already copied over on a previous call
+            if handler not in logger.handlers:
+                logger.addHandler(handler)
@@ -9,4 +9,7 @@ CREATE TABLE songs (
     play_count INTEGER DEFAULT 0,
     deleted BOOLEAN DEFAULT FALSE,
     UNIQUE(artist, title, year)
-);
\ No newline at end of file
+);
+
+-- Backs the catalog listing, which filters on deleted and sorts by play count
+CREATE INDEX idx_songs_deleted_play_count ON songs (deleted, play_count);
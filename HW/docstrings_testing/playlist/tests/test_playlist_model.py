@@ -14,6 +14,11 @@ def mock_update_play_count(mocker):
     """Mock the update_play_count function for testing purposes."""
     return mocker.patch("music_collection.models.playlist_model.update_play_count")
 
+@pytest.fixture
+def mock_update_play_counts(mocker):
+    """Mock the update_play_counts function for testing purposes."""
+    return mocker.patch("music_collection.models.playlist_model.update_play_counts")
+
 """Fixtures providing sample songs for the tests."""
 @pytest.fixture
 def sample_song1():
@@ -57,6 +62,14 @@ def test_remove_song_from_playlist_by_song_id(playlist_model, sample_playlist):
     assert len(playlist_model.playlist) == 1, f"Expected 1 song, but got {len(playlist_model.playlist)}"
     assert playlist_model.playlist[0].id == 2, "Expected song with id 2 to remain"
 
+def test_remove_song_from_playlist_by_song_id_not_found(playlist_model, sample_playlist):
+    """Test error when removing a song that is not in the playlist."""
+    playlist_model.playlist.extend(sample_playlist)
+
+    with pytest.raises(ValueError, match="Song with id 3 not found in playlist"):
+        playlist_model.remove_song_by_song_id(3)
+    assert len(playlist_model.playlist) == 2, "Expected the playlist to be unchanged"
+
 def test_remove_song_by_track_number(playlist_model, sample_playlist):
     """Test removing a song from the playlist by track number."""
     playlist_model.playlist.extend(sample_playlist)
@@ -107,6 +120,14 @@ def test_swap_song_with_itself(playlist_model, sample_song1):
     with pytest.raises(ValueError, match="Cannot swap a song with itself"):
         playlist_model.swap_songs_in_playlist(1, 1)  # Swap positions of Song 1 with itself
 
+def test_swap_song_not_in_playlist(playlist_model, sample_playlist):
+    """Test swapping with a song that is not in the playlist raises an error."""
+    playlist_model.playlist.extend(sample_playlist)
+
+    with pytest.raises(ValueError, match="Song with id 3 not found in playlist"):
+        playlist_model.swap_songs_in_playlist(1, 3)
+    assert [song.id for song in playlist_model.playlist] == [1, 2], "Expected the playlist order to be unchanged"
+
 def test_move_song_to_end(playlist_model, sample_playlist):
     """Test moving a song to the end of the playlist."""
     playlist_model.playlist.extend(sample_playlist)
@@ -283,29 +304,27 @@ def test_go_to_track_number(playlist_model, sample_playlist):
     playlist_model.go_to_track_number(2)
     assert playlist_model.current_track_number == 2, "Expected to be at track 2 after moving song"
 
-def test_play_entire_playlist(playlist_model, sample_playlist, mock_update_play_count):
+def test_play_entire_playlist(playlist_model, sample_playlist, mock_update_play_counts):
     """Test playing the entire playlist."""
     playlist_model.playlist.extend(sample_playlist)
+    playlist_model.current_track_number = 2
 
     playlist_model.play_entire_playlist()
 
-    # Check that all play counts were updated
-    mock_update_play_count.assert_any_call(1)
-    mock_update_play_count.assert_any_call(2)
-    assert mock_update_play_count.call_count == len(playlist_model.playlist)
+    # Check that all play counts were updated in a single batch
+    mock_update_play_counts.assert_called_once_with([1, 2])
 
     # Check that the current track number was updated back to the first song
     assert playlist_model.current_track_number == 1, "Expected to loop back to the beginning of the playlist"
 
-def test_play_rest_of_playlist(playlist_model, sample_playlist, mock_update_play_count):
+def test_play_rest_of_playlist(playlist_model, sample_playlist, mock_update_play_counts):
     """Test playing from the current position to the end of the playlist."""
     playlist_model.playlist.extend(sample_playlist)
     playlist_model.current_track_number = 2
 
     playlist_model.play_rest_of_playlist()
 
-    # Check that play counts were updated for the remaining songs
-    mock_update_play_count.assert_any_call(2)
-    assert mock_update_play_count.call_count == 1
+    # Check that play counts were updated for the remaining songs in a single batch
+    mock_update_play_counts.assert_called_once_with([2])
 
     assert playlist_model.current_track_number == 1, "Expected to loop back to the beginning of the playlist"
\ No newline at end of file
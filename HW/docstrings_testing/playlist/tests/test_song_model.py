@@ -6,6 +6,7 @@ import pytest
 
 from music_collection.models.song_model import (
     Song,
+    _invalidate_song_cache,
     create_song,
     clear_catalog,
     delete_song,
@@ -13,7 +14,8 @@ from music_collection.models.song_model import (
     get_song_by_compound_key,
     get_all_songs,
     get_random_song,
-    update_play_count
+    update_play_count,
+    update_play_counts
 )
 
 ######################################################
@@ -44,6 +46,9 @@ def mock_cursor(mocker):
 
     mocker.patch("music_collection.models.song_model.get_db_connection", mock_get_db_connection)
 
+    # Start every test with an empty song cache
+    _invalidate_song_cache()
+
     return mock_cursor  # Return the mock cursor so we can set expectations per test
 
 ######################################################
@@ -216,6 +221,29 @@ def test_get_song_by_id_bad_id(mock_cursor):
     with pytest.raises(ValueError, match="Song with ID 999 not found"):
         get_song_by_id(999)
 
+def test_get_song_by_id_cached(mock_cursor):
+    """Test that a repeated lookup is served from the cache without a query."""
+    mock_cursor.fetchone.return_value = (1, "Artist Name", "Song Title", 2022, "Pop", 180, False)
+
+    first = get_song_by_id(1)
+    second = get_song_by_id(1)
+
+    assert first == second
+    assert mock_cursor.execute.call_count == 1, "Expected the second lookup to be served from the cache"
+
+def test_get_song_by_id_cache_invalidated_on_delete(mock_cursor):
+    """Test that deleting a song drops it from the cache."""
+    mock_cursor.fetchone.return_value = (1, "Artist Name", "Song Title", 2022, "Pop", 180, False)
+    get_song_by_id(1)
+
+    # Soft delete the song, then simulate the row now being marked as deleted
+    mock_cursor.fetchone.return_value = [False]
+    delete_song(1)
+    mock_cursor.fetchone.return_value = (1, "Artist Name", "Song Title", 2022, "Pop", 180, True)
+
+    with pytest.raises(ValueError, match="Song with ID 1 has been deleted"):
+        get_song_by_id(1)
+
 def test_get_song_by_compound_key(mock_cursor):
     # Simulate that the song exists (artist = "Artist Name", title = "Song Title", year = 2022)
     mock_cursor.fetchone.return_value = (1, "Artist Name", "Song Title", 2022, "Pop", 180, False)
@@ -333,11 +361,10 @@ def test_get_all_songs_ordered_by_play_count(mock_cursor):
 def test_get_random_song(mock_cursor, mocker):
     """Test retrieving a random song from the catalog."""
 
-    # Simulate that there are multiple songs in the database
-    mock_cursor.fetchall.return_value = [
-        (1, "Artist A", "Song A", 2020, "Rock", 210, 10),
-        (2, "Artist B", "Song B", 2021, "Pop", 180, 20),
-        (3, "Artist C", "Song C", 2022, "Jazz", 200, 5)
+    # Simulate that there are three songs in the database, then return the 2nd one
+    mock_cursor.fetchone.side_effect = [
+        (3,),
+        (2, "Artist B", "Song B", 2021, "Pop", 180)
     ]
 
     # Mock random number generation to return the 2nd song
@@ -346,7 +373,7 @@ def test_get_random_song(mock_cursor, mocker):
     # Call the get_random_song method
     result = get_random_song()
 
-    # Expected result based on the mock random number and fetchall return value
+    # Expected result based on the mock random number and fetchone return value
     expected_result = Song(2, "Artist B", "Song B", 2021, "Pop", 180)
 
     # Ensure the result matches the expected output
@@ -355,28 +382,63 @@ def test_get_random_song(mock_cursor, mocker):
     # Ensure that the random number was called with the correct number of songs
     mock_random.assert_called_once_with(3)
 
-    # Ensure the SQL query was executed correctly
-    expected_query = normalize_whitespace("SELECT id, artist, title, year, genre, duration, play_count FROM songs WHERE deleted = FALSE")
-    actual_query = normalize_whitespace(mock_cursor.execute.call_args[0][0])
+    # Ensure the SQL queries were executed correctly
+    expected_count_query = normalize_whitespace("SELECT COUNT(*) FROM songs WHERE deleted = FALSE")
+    actual_count_query = normalize_whitespace(mock_cursor.execute.call_args_list[0][0][0])
+    assert actual_count_query == expected_count_query, "The SQL query did not match the expected structure."
 
-    # Assert that the SQL query was correct
+    expected_query = normalize_whitespace("SELECT id, artist, title, year, genre, duration FROM songs WHERE deleted = FALSE ORDER BY id LIMIT 1 OFFSET ?")
+    actual_query = normalize_whitespace(mock_cursor.execute.call_args[0][0])
     assert actual_query == expected_query, "The SQL query did not match the expected structure."
 
+    # Ensure the offset was adjusted for 0-based indexing
+    actual_arguments = mock_cursor.execute.call_args[0][1]
+    assert actual_arguments == (1,), f"The SQL query arguments did not match. Expected (1,), got {actual_arguments}."
+
+def test_get_random_song_deleted_meanwhile(mock_cursor, mocker):
+    """Test that a song deleted between counting and fetching wraps the index instead of failing."""
+
+    # Three songs are counted, but the third is deleted before it is fetched
+    mock_cursor.fetchone.side_effect = [
+        (3,),
+        None,
+        (2,),
+        (1, "Artist A", "Song A", 2020, "Rock", 200)
+    ]
+    mocker.patch("music_collection.models.song_model.get_random", return_value=3)
+
+    result = get_random_song()
+
+    assert result == Song(1, "Artist A", "Song A", 2020, "Rock", 200)
+    # Index 3 wraps onto the two remaining songs, landing on offset 0
+    assert mock_cursor.execute.call_args[0][1] == (0,)
+
+def test_get_random_song_emptied_meanwhile(mock_cursor, mocker):
+    """Test that a catalog emptied between counting and fetching reports an empty catalog."""
+
+    mock_cursor.fetchone.side_effect = [(1,), None, (0,)]
+    mocker.patch("music_collection.models.song_model.get_random", return_value=1)
+
+    with pytest.raises(ValueError, match="The song catalog is empty."):
+        get_random_song()
+
 def test_get_random_song_empty_catalog(mock_cursor, mocker):
     """Test retrieving a random song when the catalog is empty."""
 
     # Simulate that the catalog is empty
-    mock_cursor.fetchall.return_value = []
+    mock_cursor.fetchone.return_value = (0,)
+    mock_random = mocker.patch("music_collection.models.song_model.get_random")
 
     # Expect a ValueError to be raised when calling get_random_song with an empty catalog
     with pytest.raises(ValueError, match="The song catalog is empty"):
         get_random_song()
 
     # Ensure that the random number was not called since there are no songs
-    mocker.patch("music_collection.models.song_model.get_random").assert_not_called()
+    mock_random.assert_not_called()
 
-    # Ensure the SQL query was executed correctly
-    expected_query = normalize_whitespace("SELECT id, artist, title, year, genre, duration, play_count FROM songs WHERE deleted = FALSE")
+    # Ensure only the count query was executed
+    expected_query = normalize_whitespace("SELECT COUNT(*) FROM songs WHERE deleted = FALSE")
+    mock_cursor.execute.assert_called_once()
     actual_query = normalize_whitespace(mock_cursor.execute.call_args[0][0])
 
     # Assert that the SQL query was correct
@@ -386,7 +448,7 @@ def test_update_play_count(mock_cursor):
     """Test updating the play count of a song."""
 
     # Simulate that the song exists and is not deleted (id = 1)
-    mock_cursor.fetchone.return_value = [False]
+    mock_cursor.rowcount = 1
 
     # Call the update_play_count function with a sample song ID
     song_id = 1
@@ -394,17 +456,18 @@ def test_update_play_count(mock_cursor):
 
     # Normalize the expected SQL query
     expected_query = normalize_whitespace("""
-        UPDATE songs SET play_count = play_count + 1 WHERE id = ?
+        UPDATE songs SET play_count = play_count + 1 WHERE id = ? AND deleted = FALSE
     """)
 
-    # Ensure the SQL query was executed correctly
-    actual_query = normalize_whitespace(mock_cursor.execute.call_args_list[1][0][0])
+    # Ensure the update was the only SQL query executed
+    assert mock_cursor.execute.call_count == 1
+    actual_query = normalize_whitespace(mock_cursor.execute.call_args[0][0])
 
     # Assert that the SQL query was correct
     assert actual_query == expected_query, "The SQL query did not match the expected structure."
 
     # Extract the arguments used in the SQL call
-    actual_arguments = mock_cursor.execute.call_args_list[1][0][1]
+    actual_arguments = mock_cursor.execute.call_args[0][1]
 
     # Assert that the SQL query was executed with the correct arguments (song ID)
     expected_arguments = (song_id,)
@@ -415,11 +478,60 @@ def test_update_play_count_deleted_song(mock_cursor):
     """Test error when trying to update play count for a deleted song."""
 
     # Simulate that the song exists but is marked as deleted (id = 1)
+    mock_cursor.rowcount = 0
     mock_cursor.fetchone.return_value = [True]
 
     # Expect a ValueError when attempting to update a deleted song
     with pytest.raises(ValueError, match="Song with ID 1 has been deleted"):
         update_play_count(1)
 
-    # Ensure that no SQL query for updating play count was executed
-    mock_cursor.execute.assert_called_once_with("SELECT deleted FROM songs WHERE id = ?", (1,))
+    # Ensure that the song was looked up only after the update matched no rows
+    mock_cursor.execute.assert_called_with("SELECT deleted FROM songs WHERE id = ?", (1,))
+
+def test_update_play_count_bad_id(mock_cursor):
+    """Test error when trying to update play count for a song that does not exist."""
+
+    # Simulate that no song has the given ID
+    mock_cursor.rowcount = 0
+    mock_cursor.fetchone.return_value = None
+
+    with pytest.raises(ValueError, match="Song with ID 999 not found"):
+        update_play_count(999)
+
+def test_update_play_counts(mock_cursor):
+    """Test updating the play counts of several songs in one statement."""
+
+    # Simulate that both songs exist and are not deleted
+    mock_cursor.rowcount = 2
+
+    update_play_counts([1, 2])
+
+    expected_query = normalize_whitespace("""
+        UPDATE songs SET play_count = play_count + 1 WHERE id IN (?, ?) AND deleted = FALSE
+    """)
+    assert mock_cursor.execute.call_count == 1
+    actual_query = normalize_whitespace(mock_cursor.execute.call_args[0][0])
+    assert actual_query == expected_query, "The SQL query did not match the expected structure."
+
+    actual_arguments = mock_cursor.execute.call_args[0][1]
+    assert actual_arguments == (1, 2), f"The SQL query arguments did not match. Expected (1, 2), got {actual_arguments}."
+
+def test_update_play_counts_deleted_song(mock_cursor):
+    """Test error when one of the songs in the batch is deleted."""
+
+    # Simulate that song 2 is marked as deleted, so only song 1 was updated
+    mock_cursor.rowcount = 1
+    mock_cursor.fetchall.return_value = [(1, False), (2, True)]
+
+    with pytest.raises(ValueError, match="Song with ID 2 has been deleted"):
+        update_play_counts([1, 2])
+
+def test_update_play_counts_concurrent_change(mock_cursor):
+    """Test error instead of an empty commit when the batch misses songs that look playable."""
+
+    # Simulate song 2 being restored between the update and the follow-up check
+    mock_cursor.rowcount = 1
+    mock_cursor.fetchall.return_value = [(1, False), (2, False)]
+
+    with pytest.raises(ValueError, match="no play counts were incremented"):
+        update_play_counts([1, 2])
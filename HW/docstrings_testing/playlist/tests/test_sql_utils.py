@@ -0,0 +1,97 @@
+import queue
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from music_collection.utils import sql_utils
+from music_collection.utils.sql_utils import get_db_connection
+
+
+######################################################
+#
+#    Fixtures
+#
+######################################################
+
+@pytest.fixture
+def single_conn_pool(monkeypatch, tmp_path):
+    """Give each test a fresh pool of one connection over a scratch database."""
+    monkeypatch.setattr(sql_utils, "DB_PATH", str(tmp_path / "pool.db"))
+    monkeypatch.setattr(sql_utils, "POOL_SIZE", 1)
+    monkeypatch.setattr(sql_utils, "_pool", queue.LifoQueue(maxsize=1))
+    monkeypatch.setattr(sql_utils, "_pool_created", 0)
+
+######################################################
+#
+#    Pool
+#
+######################################################
+
+def test_connection_is_reused(single_conn_pool):
+    """Test that a returned connection is handed to the next caller."""
+    with get_db_connection() as first:
+        pass
+    with get_db_connection() as second:
+        assert second is first
+
+def test_discarded_connection_is_replaced(single_conn_pool):
+    """Test that a connection that hit a database error is not handed out again."""
+    with pytest.raises(sqlite3.OperationalError):
+        with get_db_connection() as broken:
+            broken.execute("SELECT * FROM missing_table")
+
+    with get_db_connection() as conn:
+        assert conn is not broken
+        assert conn.execute("SELECT 1").fetchone() == (1,)
+    assert sql_utils._pool_created == 1
+
+def test_discard_wakes_waiting_thread(single_conn_pool):
+    """Test that a thread waiting on a full pool gets a connection when the holder's is discarded."""
+    holding = threading.Event()
+    release = threading.Event()
+    acquired = threading.Event()
+
+    def hold_then_fail():
+        with pytest.raises(sqlite3.OperationalError):
+            with get_db_connection() as conn:
+                holding.set()
+                release.wait(5)
+                conn.execute("SELECT * FROM missing_table")
+
+    def wait_for_connection():
+        with get_db_connection() as conn:
+            conn.execute("SELECT 1")
+            acquired.set()
+
+    holder = threading.Thread(target=hold_then_fail, daemon=True)
+    holder.start()
+    assert holding.wait(5)
+
+    waiter = threading.Thread(target=wait_for_connection, daemon=True)
+    waiter.start()
+    time.sleep(0.2)  # Let the waiter block on the full pool before the holder fails
+    release.set()
+
+    assert acquired.wait(2), "Waiting thread never got a connection after the discard."
+    holder.join(5)
+    waiter.join(5)
+
+def test_waiting_thread_opens_connection_when_replacement_fails(single_conn_pool, mocker):
+    """Test that a waiting thread opens its own connection if the discard could not replace one."""
+    with get_db_connection() as conn:
+        pass
+
+    # The replacement fails once; the freed slot must still be picked up
+    make_conn = sql_utils._make_conn
+    mocker.patch.object(sql_utils, "_make_conn", side_effect=[sqlite3.OperationalError("disk I/O error"), make_conn()])
+
+    with pytest.raises(sqlite3.OperationalError):
+        with get_db_connection() as conn:
+            conn.execute("SELECT * FROM missing_table")
+    assert sql_utils._pool_created == 0
+
+    with get_db_connection() as conn:
+        assert conn.execute("SELECT 1").fetchone() == (1,)
+    assert sql_utils._pool_created == 1